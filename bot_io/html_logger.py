@@ -30,9 +30,9 @@ from __future__ import annotations
 import os
 import shutil
 import threading
-from datetime import datetime as _dt
+import time
 from pathlib import Path
-from typing import Final, Optional
+from typing import Final, Iterable, Optional, Tuple
 from project_config import LOG_LEVEL, HTML_LOG_DIR
 
 from utils.logger import setup_logger
@@ -48,7 +48,7 @@ class _HtmlLogger:
     _lock = threading.Lock()
 
     def __init__(self) -> None:
-        ts = _dt.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        ts = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
         base_dir = HTML_LOG_DIR
         base_dir.mkdir(parents=True, exist_ok=True)
         self._img_dir = base_dir / "img"
@@ -86,7 +86,19 @@ class _HtmlLogger:
 
     # ------------------------------------------------------------------
     def add(self, text: str, level: str = "info", screenshot: Optional[Path] = None) -> None:
-        ts = _dt.utcnow().isoformat(timespec="seconds")
+        self.add_many([(text, level, screenshot)])
+
+    def add_many(self, entries: Iterable[Tuple[str, str, Optional[Path]]]) -> None:
+        """Дописать пачку записей одним открытием файла."""
+        blocks = "".join(self._block(*entry) for entry in entries)
+        if not blocks:
+            return
+        with self._lock, self._file.open("a", encoding="utf-8") as fh:
+            fh.write(blocks)
+
+    def _block(self, text: str, level: str, screenshot: Optional[Path]) -> str:
+        # тот же формат, что isoformat(timespec="seconds"), без datetime на каждую запись
+        ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
         img_tag = ""
         if screenshot and screenshot.exists():
             dest = self._img_dir / screenshot.name
@@ -97,11 +109,7 @@ class _HtmlLogger:
             img_tag = (
                 f"<img src='img/{dest.name}' data-full='img/{dest.name}' alt='scr' />"
             )
-        block = (
-            f"<div class='entry {level}'><b>{ts}</b> – {text} {img_tag}</div>\n"
-        )
-        with self._lock, self._file.open("a", encoding="utf-8") as fh:
-            fh.write(block)
+        return f"<div class='entry {level}'><b>{ts}</b> – {text} {img_tag}</div>\n"
 
 
 # singleton instance
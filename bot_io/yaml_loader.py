@@ -20,7 +20,13 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Sequence, Tuple, Dict, Any, Literal
 
 import yaml  # PyYAML
-from cryptography.fernet import Fernet, InvalidToken
+from utils.crypto_utils import decrypt
+
+# libyaml (C) в разы быстрее чистого Python; без него PyYAML – Safe(Loader|Dumper)
+try:
+    from yaml import CSafeDumper as _Dumper, CSafeLoader as _Loader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _Dumper, SafeLoader as _Loader  # type: ignore[assignment]
 
 __all__ = [
     "UserConfig",
@@ -165,7 +171,7 @@ class YAMLLoader:
     # ------------------------------------------------------------------
     def _parse_file(self, path: _pl.Path) -> UserConfig:
         with path.open("rt", encoding="utf-8") as fh:
-            raw: dict = yaml.safe_load(fh) or {}
+            raw: dict = yaml.load(fh, Loader=_Loader) or {}
 
         missing = self.REQUIRED_FIELDS - raw.keys()
         if missing:
@@ -187,7 +193,7 @@ class YAMLLoader:
             raise ConfigError("Field 'key_password' missing")
         try:
             password = self._decrypt_password(encrypted)
-        except InvalidToken as exc:
+        except ValueError as exc:
             raise ConfigError("Unable to decrypt key_password – invalid token") from exc
 
         # --- birthdate --------------------------------------------------
@@ -270,17 +276,11 @@ class YAMLLoader:
     @staticmethod
     def _decrypt_password(token: str) -> str:
         """Decrypt a Fernet token string to plaintext."""
-        # NOTE: Production code would keep the **key** in an env var / vault.
-        fernet_key_env = "FERNET_SECRET_KEY"
-        from os import getenv
-
-        key = getenv(fernet_key_env)
-        if not key:
-            raise ConfigError(
-                f"Environment variable {fernet_key_env} not set – cannot decrypt passwords"
-            )
-        f = Fernet(key.encode())
-        return f.decrypt(token.encode()).decode("utf-8")
+        # Fernet берётся из кэша crypto_utils – один экземпляр на все конфиги
+        try:
+            return decrypt(token)
+        except RuntimeError as exc:  # FERNET_SECRET_KEY не задан
+            raise ConfigError(f"{exc} – cannot decrypt passwords") from exc
     
     
     @staticmethod        
@@ -316,7 +316,7 @@ class YAMLLoader:
         LOGGER.debug(f"record_service_status {status}")
         base = user.source_file.parent
         path = base / user.source_file.name
-        raw: dict = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        raw: dict = yaml.load(path.read_text(encoding="utf-8"), Loader=_Loader) or {}
 
         raw.setdefault("status", {})
         raw["status"].setdefault(user.country, {})
@@ -333,7 +333,7 @@ class YAMLLoader:
             if comment:
                 entry["comment"] = comment
 
-        path.write_text(yaml.safe_dump(raw, allow_unicode=True, sort_keys=False), encoding="utf-8")
+        path.write_text(yaml.dump(raw, Dumper=_Dumper, allow_unicode=True, sort_keys=False), encoding="utf-8")
 
 
 # ---------------------------------------------------------------------------
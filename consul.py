@@ -3,69 +3,51 @@ from __future__ import annotations
 import sys
 import signal
 import threading
-import time
-from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict
 
 from core.gui_driver import chrome_session, ensure_layout
 from core.slot_finder import SlotFinder, free_slots
+from core.user_queue import UserQueue
 from bot_io.config_watcher import ChangeEvent, ChangeKind, ConfigWatcher
-from bot_io.yaml_loader import UserConfig, YAMLLoader, ConfigError
-from server.tcp_server import ControlServer, PAUSE_EVT, STOP_EVT
+from bot_io.yaml_loader import YAMLLoader, ConfigError
+from server.tcp_server import ControlServer, PAUSE_EVT, STOP_EVT, request_stop, wait_for_resume
 from utils.logger import setup_logger
+from utils.executors import SHARED_POOL
 from project_config import USERS_DIR, KEYS_DIR, LOG_LEVEL
 
 LOGGER = setup_logger(__name__)
 
-class UserQueue:
-    def __init__(self, initial: list[UserConfig]):
-        self._dq: deque[UserConfig] = deque(initial)
-        self._map: Dict[str, UserConfig] = {u.alias: u for u in initial}
-        self._lock = threading.Lock()
-
-    def pop_left(self) -> Optional[UserConfig]:
-        with self._lock:
-            if not self._dq:
-                return None
-            user = self._dq.popleft()
-            self._map.pop(user.alias, None)
-            return user
-
-    def append(self, user: UserConfig) -> None:
-        with self._lock:
-            self._dq.append(user)
-            self._map[user.alias] = user
-
-    def remove(self, alias: str) -> None:
-        with self._lock:
-            self._dq = deque(u for u in self._dq if u.alias != alias)
-            self._map.pop(alias, None)
-
-    def update(self, user: UserConfig) -> None:
-        with self._lock:
-            if user.alias in self._map:
-                self._dq = deque(
-                    user if u.alias == user.alias else u for u in self._dq
-                )
-                self._map[user.alias] = user
-            else:
-                self.append(user)
-
-    def exists(self, alias: str) -> bool:
-        return alias in self._map
-
-    def __bool__(self) -> bool:
-        return bool(self._dq)
+# Разбор YAML – в общем пуле, а не в потоке watchdog: поток событий ФС не блокируется.
+# Номер поколения на путь отбрасывает результат, если по файлу уже пришло новое событие.
+_PARSE_GEN: Dict[Path, int] = {}
+_PARSE_GEN_LOCK = threading.Lock()
 
 def _on_yaml_change(evt: ChangeEvent, loader: YAMLLoader, queue: UserQueue) -> None:
-    try:
+    with _PARSE_GEN_LOCK:
+        gen = _PARSE_GEN[evt.path] = _PARSE_GEN.get(evt.path, 0) + 1
+
         if evt.kind == ChangeKind.DELETED:
             queue.remove(evt.path.stem)
             LOGGER.info("YAML deleted → remove user %s", evt.path.stem)
             return
 
-        cfg = loader._parse_file(evt.path)  # type: ignore[protected-access]
+    future = SHARED_POOL.submit(loader._parse_file, evt.path)  # type: ignore[protected-access]
+    future.add_done_callback(lambda f: _apply_parsed(f, evt, gen, queue))
+
+def _apply_parsed(future: Future, evt: ChangeEvent, gen: int, queue: UserQueue) -> None:
+    try:
+        cfg = future.result()
+    except ConfigError as exc:
+        LOGGER.warning("Invalid YAML on %s: %s", evt.path.name, exc)
+        return
+
+    with _PARSE_GEN_LOCK:
+        if _PARSE_GEN.get(evt.path) != gen:
+            LOGGER.debug("YAML %s changed again – stale parse dropped", evt.path.name)
+            return
+
         if evt.kind == ChangeKind.CREATED:
             queue.append(cfg)
             LOGGER.info("YAML created → add user %s", cfg.alias)
@@ -73,13 +55,10 @@ def _on_yaml_change(evt: ChangeEvent, loader: YAMLLoader, queue: UserQueue) -> N
             queue.update(cfg)
             LOGGER.info("YAML modified → update user %s", cfg.alias)
 
-    except ConfigError as exc:
-        LOGGER.warning("Invalid YAML on %s: %s", evt.path.name, exc)
-
 def _install_signal_handlers() -> None:
     def _sig_handler(signum, _frame) -> None:
         LOGGER.info("Received signal %s – setting STOP event", signum)
-        STOP_EVT.set()
+        request_stop()
 
     for s in (signal.SIGINT, signal.SIGTERM):
         signal.signal(s, _sig_handler)
@@ -110,24 +89,20 @@ def main() -> None:
     _install_signal_handlers()
 
     finder = SlotFinder()
-    LOGGER.info("=== Bot started. Users in queue: %d ===", len(queue._dq))
+    LOGGER.info("=== Bot started. Users in queue: %d ===", len(queue))
 
     try:
         while not STOP_EVT.is_set():
             if PAUSE_EVT.is_set():
-                time.sleep(0.5)
+                # resume/stop будят сразу; таймаут – чтобы Ctrl+C на Windows не ждал
+                wait_for_resume(timeout=1.0)
                 continue
 
-            with queue._lock:
-                # приоритизация пользователей по доступным слотам
-                priority_users = [u for u in list(queue._dq) if free_slots.has_match(u)]
-                for u in priority_users:
-                    queue._dq.remove(u)
-                    queue._dq.appendleft(u)
+            # приоритизация пользователей по доступным слотам
+            queue.prioritize(free_slots.has_match)
 
-            user = queue.pop_left()
+            user = queue.pop_left(timeout=2)
             if not user:
-                time.sleep(2)
                 continue
 
             if not loader.has_pending_services(user):
@@ -149,6 +124,7 @@ def main() -> None:
     finally:
         LOGGER.info("Stop flag received – shutting down…")
         watcher.close()
+        SHARED_POOL.shutdown(wait=False, cancel_futures=True)
         ctrl_srv.shutdown()
         LOGGER.info("Exiting process.")
         sys.exit(0)
@@ -0,0 +1,95 @@
+"""
+Разбор OCR-токенов панели слотов в кортежи (start_date, end_date, slots_count).
+
+Без зависимостей от GUI/OCR – только ``re`` и ``numpy``, поэтому модуль
+импортируется и тестируется без дисплея.
+"""
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+import numpy as np
+
+MIN_OCR_CONF = 60    # токены с уверенностью tesseract ниже порога (0–100) отбрасываются
+
+DATE_RE = re.compile(r'^\d{2}\.\d{2}\.\d{4}$')
+
+# кириллическая «З» и латинская «z/Z» в датах – это цифра «3»
+_DATE_TOKEN_FIXES = str.maketrans('ЗzZ', '333')
+
+
+def _is_separator(tok: str) -> bool:
+    """Односимвольный токен-пунктуация («-», «–» …)."""
+    t = tok.strip()
+    return len(t) == 1 and not t.isalnum()
+
+
+def normalize_date_token(tok: str) -> str:
+    """
+    Нормализует «кривые» даты вида:
+    - заменяет кириллическую «З» или латинскую «Z» на цифру «3»
+    - если осталось «0.mm.yyyy» (односимвольный день «0»), преобразует в «30.mm.yyyy»
+    """
+    # 1) Заменяем кириллическую З или латинскую Z на цифру 3 (один проход)
+    t = tok.strip().translate(_DATE_TOKEN_FIXES)
+
+    # 2) Если получилось «0.mm.yyyy» (без ведущей цифры дня), добавляем «3» спереди
+    #    Напр.: «0.06.2025» → «30.06.2025»
+    if (len(t) == 9 and t[0] == '0' and t[1] == '.' and t[4] == '.'
+            and t[2:4].isdigit() and t[5:].isdigit()):
+        t = '30' + t[1:]
+
+    return t
+
+
+def normalize_tokens(tokens: List[str]) -> List[str]:
+    """
+    Применяет normalize_date_token ко всем токенам в списке.
+    """
+    return [normalize_date_token(tok) for tok in tokens]
+
+
+def parse_date_slots(tokens: List[str],
+                     confs: List[float] | None = None) -> List[Tuple[str, str, int]]:
+    """
+    Из списка токенов (после нормализации) собирает кортежи
+    (start_date, end_date, slots_count).
+    Если переданы confs (уверенность OCR по каждому токену), токены ниже
+    MIN_OCR_CONF отбрасываются до разбора – мусор не угадывается, а пропускается.
+    Односимвольные разделители («-» между датами) порогу не подлежат:
+    tesseract часто даёт им низкую уверенность, а без них диапазон не собрать.
+    """
+
+    if confs is not None:
+        tokens = [
+            tok for tok, conf in zip(tokens, confs)
+            if float(conf) >= MIN_OCR_CONF or _is_separator(tok)
+        ]
+
+    tokens = normalize_tokens(tokens)
+
+    n = len(tokens)
+    if n < 4:
+        return []
+
+    # флаги по всем токенам сразу – дальше только векторные операции numpy
+    toks = [tok.strip() for tok in tokens]
+    is_date = np.fromiter((DATE_RE.match(t) is not None for t in toks), dtype=bool, count=n)
+    is_dash = np.fromiter((t == "-" for t in toks), dtype=bool, count=n)
+    is_num = np.fromiter((t.isdigit() for t in toks), dtype=bool, count=n)
+
+    # начало диапазона: «дата» «-» «дата» в трёх соседних токенах
+    starts = np.flatnonzero(is_date[:-2] & is_dash[1:-1] & is_date[2:])
+
+    # индекс ближайшего числа справа для каждой позиции (n – чисел дальше нет)
+    idx = np.where(is_num, np.arange(n), n)
+    next_num = np.minimum.accumulate(idx[::-1])[::-1]
+
+    result: List[Tuple[str, str, int]] = []
+    for i in starts.tolist():
+        j = int(next_num[i + 3]) if i + 3 < n else n
+        if j < n:
+            result.append((toks[i], toks[i + 2], int(toks[j])))
+
+    return result
@@ -13,6 +13,7 @@ Low-level wrapper around PyAutoGUI + OpenCV (и опционально OCR),
 from __future__ import annotations
 
 import os
+import hashlib
 import random
 import subprocess
 import time
@@ -37,6 +38,7 @@ from difflib import SequenceMatcher
 
 from utils.logger import setup_logger
 from utils.profile_manager import prepare_profile
+from utils.executors import SHARED_POOL
 from project_config import (LOG_LEVEL, TEMPLATE_DIR,
                             MONITOR_WIDTH, MONITOR_HEIGHT,
                             MONITOR_INDEX,TESSERCAT_CMD,
@@ -51,6 +53,7 @@ import win32con
 import win32api
 import threading
 import win32process
+from collections import OrderedDict
 
 LOGGER = setup_logger(__name__)
 pag.FAILSAFE = True  # оставить возможность «движения мыши в угол для экстренной остановки»
@@ -75,6 +78,24 @@ with mss.mss() as sct:
         MON_X, MON_Y, MON_W, MON_H = mon["left"], mon["top"], mon["width"], mon["height"]
         LOGGER.warning("monitor_index=%d is invalid, using primary monitor #%d", MONITOR_INDEX, 1)
 
+# MSS держит DC экрана; на Windows его хэндлы привязаны к потоку,
+# поэтому один экземпляр на поток, открытый на всю сессию.
+_GRABBER = threading.local()
+
+def _grabber() -> mss.base.MSSBase:
+    sct = getattr(_GRABBER, "sct", None)
+    if sct is None:
+        sct = _GRABBER.sct = mss.mss()
+    return sct
+
+def _grab_bgra(scope: tuple[int, int, int, int] = None) -> np.ndarray:
+    """
+    Снять область экрана как BGRA-массив (h, w, 4) без копирования:
+    numpy-представление поверх буфера MSS, а не np.array(ScreenShot).
+    """
+    shot = _grabber().grab(_get_monitor_region(scope))
+    return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
 def pause(amount):
     LOGGER.debug(f"pause {amount} second")
     time.sleep(amount)
@@ -151,6 +172,16 @@ def arrays_fuzzy_equal_as_one_str(window: List[str], query_words: List[str], thr
     
     return ratio >= threshold
 
+def frame_hash(img: np.ndarray) -> int:
+    """
+    64-битный хеш точного содержимого кадра (blake2b по байтам + форма).
+    Используется как ключ кэшей OCR: одинаковый кадр → одинаковый результат.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    h.update(repr(img.shape).encode())
+    h.update(np.ascontiguousarray(img).data)
+    return int.from_bytes(h.digest(), "little")
+
 def launch_chrome(profile_dir: Path, url: str = "https://e-consul.gov.ua/messages") -> subprocess.Popen:
     """
     The function `launch_chrome` launches Chrome with specified profile directory, window size, and
@@ -211,13 +242,13 @@ def detect_checkbox_type_from_frame(scope: tuple[int, int, int, int] = None,
     
 
     # Загружаем оба шаблона сразу в градациях серого
-    templ_empty = cv2.imread(str(TEMPLATE_DIR / CHECK_EMPTY_TEMPLATE_PATH))
-    
-    templ_checked = cv2.imread(str(TEMPLATE_DIR / CHECK_CHECKED_TEMPLATE_PATH))
-    
-    if templ_empty is None:
+    try:
+        templ_empty = load_template(TEMPLATE_DIR / CHECK_EMPTY_TEMPLATE_PATH, color=True)
+    except RuntimeError:
         raise FileNotFoundError(f"Не найден шаблон «пустой» по пути {TEMPLATE_DIR / CHECK_EMPTY_TEMPLATE_PATH}")
-    if templ_checked is None:
+    try:
+        templ_checked = load_template(TEMPLATE_DIR / CHECK_CHECKED_TEMPLATE_PATH, color=True)
+    except RuntimeError:
         raise FileNotFoundError(f"Не найден шаблон «с галочкой» по пути {TEMPLATE_DIR / CHECK_CHECKED_TEMPLATE_PATH}")
 
     if is_debug:
@@ -246,26 +277,23 @@ def detect_checkbox_type_from_frame(scope: tuple[int, int, int, int] = None,
 def detect_image_from_frame(image_names: list[str], scope: tuple[int, int, int, int] = None,
                 is_debug: bool = False,
                 threshold: float = 0.8) -> str:
-   
-    frame_bgr = screen(scope)
-    
-    # Конвертируем скрин в оттенки серого
-    gray_frame = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+    """
+    Какой из шаблонов `image_names` лучше всего совпадает с областью `scope`.
+    Кадр снимается и переводится в серый один раз для всех шаблонов.
+    Возвращает имя шаблона с наибольшим коэффициентом совпадения.
+    """
+    frame_gray = screen(scope, is_debug=is_debug, gray=True)
 
-    max_weight = -10000
-    check_image = ""
-    
-    for image_name in image_names:
-        templ = cv2.imread(TEMPLATE_DIR / image_name, cv2.IMREAD_GRAYSCALE)
-        if templ is None:
-            raise FileNotFoundError(f"Не найден шаблон «пустой» по пути {TEMPLATE_DIR / image_name}")
-        res = cv2.matchTemplate(gray_frame, templ, cv2.TM_CCOEFF_NORMED)
-        _, weight, _, _ = cv2.minMaxLoc(res)
-        
-        if weight > max_weight:
-            check_image = image_name
+    paths = [TEMPLATE_DIR / image_name for image_name in image_names]
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(f"Не найден шаблон по пути {path}")
 
-        return check_image
+    scores = _match_many(frame_gray, paths)
+    weights = [scores[str(path)][0] for path in paths]
+    LOGGER.debug(f"detect_image_from_frame weights: {dict(zip(image_names, weights))}")
+
+    return image_names[int(np.argmax(weights))]
 
 def find_image(name: str, timeout: float = 8.0, confidence: float = 0.7,
                 scope: tuple[int, int, int, int] = None,
@@ -330,23 +358,43 @@ def type_text(text: str, interval: Tuple[float, float] = (0.05, 0.12)) -> None:
         pag.typewrite(ch)
         time.sleep(random.uniform(*interval))
 
-def take_screenshot() -> Path:
+class PendingScreenshot:
     """
-    Сделать PNG скрин целевого MONITOR_INDEX с помощью MSS и вернуть Path.
+    Кадр целевого MONITOR_INDEX, снятый в момент создания; PNG кодируется и
+    пишется во временный каталог только в ``save()`` (обычно – в потоке лога).
     """
-    import tempfile, datetime as dt
 
-    ts = dt.datetime.utcnow().isoformat().replace(":", "-")
-    output_path = Path(tempfile.gettempdir()) / f"scr_{ts}.png"
+    __slots__ = ("_img", "_path")
 
-    with mss.mss() as sct:
+    def __init__(self) -> None:
+        import tempfile, datetime as dt
+
+        ts = dt.datetime.utcnow().isoformat().replace(":", "-")
+        self._path = Path(tempfile.gettempdir()) / f"scr_{ts}.png"
         # Снимаем именно ту область, что описывает монитора:
         monitor_region = {"top": MON_Y, "left": MON_X, "width": MON_W, "height": MON_H}
-        img_data = sct.grab(monitor_region)
+        self._img = _grabber().grab(monitor_region)
+
+    def save(self) -> Path:
         # Записываем в PNG (MSS возвращает raw-битмап):
-        mss.tools.to_png(img_data.rgb, img_data.size, output=str(output_path))
+        mss.tools.to_png(self._img.rgb, self._img.size, output=str(self._path))
+        return self._path
+
+
+def lazy_screenshot() -> PendingScreenshot:
+    """
+    Снять целевой MONITOR_INDEX сейчас, а PNG закодировать и записать позже.
+
+    Кадр фиксируется в момент вызова `lazy_screenshot`, поэтому отложенная
+    запись (``.save()``) показывает тот же экран.
+    """
+    return PendingScreenshot()
 
-    return output_path
+def take_screenshot() -> Path:
+    """
+    Сделать PNG скрин целевого MONITOR_INDEX с помощью MSS и вернуть Path.
+    """
+    return lazy_screenshot().save()
 
 def show_image(img) -> None:
     # Показать изображение через matplotlib
@@ -378,76 +426,200 @@ def scroll(amount: int = 100) -> None:
         time.sleep(0.01) 
 
 def screen(scope: tuple[int, int, int, int] = None, is_debug: bool = False,
-           process_for_read:bool = False):
-    with mss.mss() as sct:
-        monitor_region = _get_monitor_region(scope)
-        img_data = sct.grab(monitor_region)
-        # Конвертируем в numpy.ndarray в BGR для OpenCV:
-        scr_np = np.array(img_data)
-        scr_bgr = cv2.cvtColor(scr_np, cv2.COLOR_BGRA2BGR)
-        
-        if process_for_read:
-            scr_bgr = preprocess_for_ocr(scr_bgr)
-        
+           process_for_read:bool = False, gray: bool = False):
+    # BGRA-буфер MSS → BGR (или сразу в серый) для OpenCV одним cvtColor
+    if gray and not process_for_read:
+        scr_bgr = cv2.cvtColor(_grab_bgra(scope), cv2.COLOR_BGRA2GRAY)
+    else:
+        scr_bgr = cv2.cvtColor(_grab_bgra(scope), cv2.COLOR_BGRA2BGR)
+
+    if process_for_read:
+        scr_bgr = preprocess_for_ocr(scr_bgr)
+
     if is_debug:
         show_image(scr_bgr)
         time.sleep(0.5)
             
     return scr_bgr
 
+def wait_until_stable(scope: tuple[int, int, int, int] = None,
+                      interval: float = 0.08, timeout: float = 1.0) -> bool:
+    """
+    Ждёт, пока область экрана перестанет меняться: два кадра подряд,
+    снятые через `interval` секунд, совпадают попиксельно.
+    Возвращает True, если UI успокоился, иначе False по истечении `timeout`.
+    """
+    deadline = time.monotonic() + timeout
+    prev = _grab_bgra(scope)
+    while True:
+        time.sleep(interval)
+        cur = _grab_bgra(scope)
+        if np.array_equal(prev, cur):
+            return True
+        if time.monotonic() >= deadline:
+            LOGGER.debug(f"screen not stable after {timeout}s, scope: {scope}")
+            return False
+        prev = cur
+
+def wait_for_pixel_change(scope: tuple[int, int, int, int] = None,
+                          interval: float = 0.3, timeout: float = 60.0,
+                          threshold: float = 0.02) -> bool:
+    """
+    Ждёт, пока область экрана заметно изменится относительно первого кадра.
+
+    Изменённым считается пиксель, у которого хоть один канал отличается больше
+    чем на 16; событие – доля таких пикселей выше `threshold`. Мелкая анимация
+    (спиннер, мигающий курсор) порог не переходит, смена текста – переходит.
+    Возвращает True при изменении, False по истечении `timeout`.
+    """
+    deadline = time.monotonic() + timeout
+    base = _grab_bgra(scope)
+    n_pixels = base.shape[0] * base.shape[1]
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        cur = _grab_bgra(scope)  # альфа-канал у MSS всегда 255 – на разницу не влияет
+        changed = np.count_nonzero(cv2.absdiff(base, cur).max(axis=2) > 16)
+        if changed > threshold * n_pixels:
+            return True
+    LOGGER.debug(f"no pixel change in {timeout}s, scope: {scope}")
+    return False
+
+# ---------------------------------------------------------------------------
+# Template cache: PNG читается и декодируется один раз за процесс
+# ---------------------------------------------------------------------------
+# (путь, color, scale) → шаблон; масштабированные варианты тоже запоминаются
+_TEMPLATES: dict[tuple[str, bool, float], np.ndarray] = {}
+# последнее место шаблона в области: (путь, scope, color) → top-left (x, y) внутри кадра
+_LAST_HIT: dict[tuple[str, tuple[int, int, int, int] | None, bool], tuple[int, int]] = {}
+
+def load_template(template_path: Path, color: bool = False, scale: float = 1.0) -> np.ndarray:
+    """
+    Вернуть шаблон из кэша, при первом обращении – прочитать с диска.
+    По умолчанию одноканальный (серый); `color=True` – BGR.
+    `scale` ≠ 1 – уменьшенная/увеличенная копия (INTER_AREA), тоже из кэша.
+    """
+    key = (str(template_path), color, round(float(scale), 3))
+    templ = _TEMPLATES.get(key)
+    if templ is not None:
+        return templ
+
+    if key[2] != 1.0:
+        base = load_template(template_path, color=color)
+        new_w = int(base.shape[1] * scale)
+        new_h = int(base.shape[0] * scale)
+        templ = cv2.resize(base, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    else:
+        flags = cv2.IMREAD_COLOR if color else cv2.IMREAD_GRAYSCALE
+        templ = cv2.imread(key[0], flags)
+        if templ is None:
+            raise RuntimeError(f"Cannot read template: {template_path}")
+    _TEMPLATES[key] = templ
+    return templ
+
+def _preload_templates() -> None:
+    """Декодировать все PNG из TEMPLATE_DIR (серые) при импорте, а не на первом поиске."""
+    if not TEMPLATE_DIR.is_dir():
+        return
+    for path in TEMPLATE_DIR.glob("*.png"):
+        try:
+            load_template(path)
+        except RuntimeError as exc:
+            LOGGER.warning("%s", exc)
+
+_preload_templates()
+
+def _match_many(frame: np.ndarray,
+                template_paths: list[Path]) -> dict[str, tuple[float, tuple[int, int] | None]]:
+    """
+    Сравнить несколько шаблонов с одним кадром.
+    Возвращает {str(путь): (max_val, top-left (x, y))}; шаблон крупнее кадра – (-1.0, None).
+    """
+    frame_h, frame_w = frame.shape[:2]
+    scores: dict[str, tuple[float, tuple[int, int] | None]] = {}
+    for path in template_paths:
+        templ = load_template(path)
+        if templ.shape[0] > frame_h or templ.shape[1] > frame_w:
+            scores[str(path)] = (-1.0, None)
+            continue
+        res = cv2.matchTemplate(frame, templ, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        scores[str(path)] = (max_val, max_loc)
+    return scores
+
 def _locate(template_path: Path, confidence: float,
             scope: tuple[int, int, int, int] = None,
-            is_debug: bool = False) -> tuple[int, int] | None:
+            is_debug: bool = False, color: bool = False) -> tuple[int, int] | None:
     """
     Ищет шаблон (template_path) внутри прямоугольника MON_X..MON_W, MON_Y..MON_H.
     Возвращает (x_center_rel, y_center_rel) или None.
+    Сначала проверяет место прошлой находки (кнопки обычно не двигаются),
+    и только если шаблона там нет – ищет по всей области.
+    Сравнение в оттенках серого (втрое меньше данных), `color=True` – по BGR.
     """
-    scr_bgr = screen(scope, is_debug = is_debug)
+    scr_bgr = screen(scope, is_debug = is_debug, gray = not color)
     
-    # 2) Загружаем шаблон (PNG) как BGR
-    templ = cv2.imread(str(template_path))
-    if templ is None:
-        raise RuntimeError(f"Cannot read template: {template_path}")
+    # 2) Шаблон (PNG) – из кэша
+    templ = load_template(template_path, color=color)
         
     if is_debug:
         show_image(templ)
 
-    # 3) Поиск с помощью matchTemplate
-    res = cv2.matchTemplate(scr_bgr, templ, cv2.TM_CCOEFF_NORMED)
-    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
-    
-    #LOGGER.debug(f"max_val: {max_val}, confidence: {confidence}")
-    
-    if max_val < confidence or max_loc is None:
-        #LOGGER.debug("image not found")
-        return None
+    h, w = templ.shape[:2]
+    hit_key = (str(template_path), scope, color)
+    max_loc = None
+
+    # 3) Проверка на месте: matchTemplate по вырезке размером с шаблон
+    last = _LAST_HIT.get(hit_key)
+    if last is not None:
+        x0, y0 = last
+        patch = scr_bgr[y0:y0 + h, x0:x0 + w]
+        if patch.shape[:2] == (h, w):
+            val = float(cv2.matchTemplate(patch, templ, cv2.TM_CCOEFF_NORMED)[0, 0])
+            if val >= confidence:
+                max_loc = last
+
+    # 4) Полный поиск с помощью matchTemplate.
+    #    Свою FFT-свёртку не делаем: для крупных шаблонов OpenCV сам считает
+    #    корреляцию через DFT (crossCorr), а для мелких прямой проход быстрее.
+    if max_loc is None:
+        res = cv2.matchTemplate(scr_bgr, templ, cv2.TM_CCOEFF_NORMED)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+        
+        #LOGGER.debug(f"max_val: {max_val}, confidence: {confidence}")
+        
+        if max_val < confidence or max_loc is None:
+            #LOGGER.debug("image not found")
+            return None
+        _LAST_HIT[hit_key] = max_loc
     
     y_loc, x_loc = max_loc  # top-left внутри локальной (0..MON_W,0..MON_H)
     LOGGER.debug("image found")
 
-    h, w, _ = templ.shape
     center_x_rel = scope[0] + x_loc + w // 2
     center_y_rel = scope[1] + y_loc + h // 2
     return (center_x_rel, center_y_rel)
 
+PYR_REFINE_TOP = 3   # сколько лучших масштабов грубого прохода уточнять
+PYR_REFINE_PAD = 8   # запас окна уточнения вокруг грубой находки, px полного кадра
+
 def _locate_multiscale(
     template_path: Path,
     confidence: float,
     scope: tuple[int, int, int, int] = None,
-    is_debug: bool = False
+    is_debug: bool = False,
+    color: bool = False
 ) -> tuple[int, int] | None:
     """
     Multi-scale поиск шаблона template_path внутри области scope на экране.
     Пытаемся разные коэффициенты масштабирования шаблона (или скрина) и выбираем наилучшее совпадение.
     Возвращает (x_center_abs, y_center_abs) или None, если не найдено.
+    Сравнение в оттенках серого, `color=True` – по BGR.
     """
     # 1) Делаем скрин указанной области (или всего экрана, если scope=None)
-    scr_bgr = screen(scope, is_debug=is_debug)
+    scr_bgr = screen(scope, is_debug=is_debug, gray=not color)
 
     # 2) Загружаем эталонный PNG-шаблон
-    templ_orig = cv2.imread(str(template_path))
-    if templ_orig is None:
-        raise RuntimeError(f"Cannot read template: {template_path}")
+    templ_orig = load_template(template_path, color=color)
 
     # 3) Подготовим параметры для перебора масштабов
     #    (чем меньше step, тем медленнее, но точнее поиск).
@@ -460,6 +632,11 @@ def _locate_multiscale(
     # Размеры скрина
     scr_h, scr_w = scr_bgr.shape[:2]
 
+    # Грубый проход – на кадре, уменьшенном pyrDown вдвое (вчетверо меньше пикселей);
+    # точный – только в окне ±PYR_REFINE_PAD вокруг грубой находки на полном кадре
+    scr_small = cv2.pyrDown(scr_bgr)
+    candidates = []  # (max_val на грубом уровне, scale, шаблон, top-left на грубом уровне)
+
     for scale in scales:
         # 4) Изменяем размер шаблона
         new_w = int(templ_orig.shape[1] * scale)
@@ -469,21 +646,44 @@ def _locate_multiscale(
         if new_w > scr_w or new_h > scr_h:
             continue  # шаблон в этом масштабе больше экрана → пропускаем
 
-        templ = cv2.resize(templ_orig, (new_w, new_h), interpolation=cv2.INTER_AREA)
+        templ = load_template(template_path, color=color, scale=scale)
         
         if is_debug:
             show_image(templ)
 
-        # 5) Выполняем matchTemplate
-        res = cv2.matchTemplate(scr_bgr, templ, cv2.TM_CCOEFF_NORMED)
+        # 5) Грубый matchTemplate на уменьшенных кадре и шаблоне
+        templ_small = cv2.pyrDown(templ)
+        if min(templ_small.shape[:2]) < 8 or templ_small.shape[1] > scr_small.shape[1] \
+                or templ_small.shape[0] > scr_small.shape[0]:
+            # слишком мелко для пирамиды – ищем сразу на полном кадре
+            res = cv2.matchTemplate(scr_bgr, templ, cv2.TM_CCOEFF_NORMED)
+            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+            if max_val > best_val:
+                best_val, best_loc, best_scale = max_val, max_loc, scale
+            continue
+
+        res = cv2.matchTemplate(scr_small, templ_small, cv2.TM_CCOEFF_NORMED)
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
 
-        LOGGER.debug(f"[DEBUG] scale={scale:.2f}, max_val={max_val:.3f}")
+        LOGGER.debug(f"[DEBUG] scale={scale:.2f}, coarse max_val={max_val:.3f}")
+        candidates.append((max_val, scale, templ, max_loc))
+
+    # 6) Уточняем лучшие масштабы грубого прохода на полном разрешении
+    candidates.sort(key=lambda c: c[0], reverse=True)
+    for _, scale, templ, (cx, cy) in candidates[:PYR_REFINE_TOP]:
+        t_h, t_w = templ.shape[:2]
+        x0 = max(0, cx * 2 - PYR_REFINE_PAD)
+        y0 = max(0, cy * 2 - PYR_REFINE_PAD)
+        x1 = min(scr_w, cx * 2 + t_w + PYR_REFINE_PAD)
+        y1 = min(scr_h, cy * 2 + t_h + PYR_REFINE_PAD)
 
-        # 6) Сохраняем лучшее совпадение по всем масштабам
+        res = cv2.matchTemplate(scr_bgr[y0:y1, x0:x1], templ, cv2.TM_CCOEFF_NORMED)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+
+        # Сохраняем лучшее совпадение по всем масштабам
         if max_val > best_val:
             best_val = max_val
-            best_loc = max_loc
+            best_loc = (x0 + max_loc[0], y0 + max_loc[1])
             best_scale = scale
 
     # 7) Проверяем, превысил ли лучший результат наш порог confidence
@@ -736,24 +936,64 @@ def chrome_session(user_alias: str, url: str = "https://e-consul.gov.ua/messages
             except TimeoutExpired:
                 proc.kill()
 
+# латиница, похожая на кириллицу, → кириллица; таблица строится один раз
+_SIMILAR_CHARS = str.maketrans({
+    'e': 'е',  # англ e → укр е
+    'E': 'Е',  # англ E → укр Е
+    'i': 'і',  # англ i → укр і (по необходимости)
+    'I': 'І',  # англ I → укр І
+    'a': 'а',  # англ a → укр а
+    'A': 'А',  # англ A → укр А
+    'o': 'о',  # англ o → укр о
+    'O': 'О',  # англ O → укр О
+    'c': 'с',  # англ c → укр с
+    'C': 'С',  # англ C → укр С
+    'p': 'р',  # англ p → укр р
+    'P': 'Р',  # англ P → укр Р
+    'x': 'х',  # англ x → укр х
+    'X': 'Х',  # англ X → укр Х
+})
+
 def replace_similar_chars(word: str) -> str:
-    char_map = {
-        'e': 'е',  # англ e → укр е
-        'E': 'Е',  # англ E → укр Е
-        'i': 'і',  # англ i → укр і (по необходимости)
-        'I': 'І',  # англ I → укр І
-        'a': 'а',  # англ a → укр а
-        'A': 'А',  # англ A → укр А
-        'o': 'о',  # англ o → укр о
-        'O': 'О',  # англ O → укр О
-        'c': 'с',  # англ c → укр с
-        'C': 'С',  # англ C → укр С
-        'p': 'р',  # англ p → укр р
-        'P': 'Р',  # англ P → укр Р
-        'x': 'х',  # англ x → укр х
-        'X': 'Х',  # англ X → укр Х
-    }
-    return ''.join(char_map.get(c, c) for c in word)
+    return word.translate(_SIMILAR_CHARS)
+
+# ---------------------------------------------------------------------------
+# OCR: путь к Tesseract задаётся один раз; кадр бинаризуется в OpenCV
+# ---------------------------------------------------------------------------
+os.environ['TESSDATA_PREFIX'] = os.path.normpath(TESSDATA_PREFIX)
+pytesseract.pytesseract.tesseract_cmd = TESSERCAT_CMD
+
+OCR_CONFIG = "--psm 6 --oem 1"  # однородный блок текста, только LSTM
+OCR_CACHE_SIZE = 8               # последних кадров с готовым результатом OCR
+
+# (frame_hash, lang) → Output.DICT: опрос неизменившегося экрана не запускает tesseract
+_OCR_CACHE: OrderedDict[tuple[int, str], dict] = OrderedDict()
+_OCR_CACHE_LOCK = threading.Lock()
+
+def _ocr(img: np.ndarray, lang: str) -> dict:
+    """
+    OCR кадра по словам (``Output.DICT``). Цветной кадр переводится в серый и
+    бинаризуется по Otsu – tesseract получает готовое ч/б изображение и не
+    делает собственную предобработку. Уже бинаризованный кадр (2D) идёт как есть.
+    Результат кэшируется по хэшу кадра; вызывающий код его не изменяет.
+    """
+    key = (frame_hash(img), lang)
+    with _OCR_CACHE_LOCK:
+        data = _OCR_CACHE.get(key)
+        if data is not None:
+            _OCR_CACHE.move_to_end(key)
+            return data
+
+    if img.ndim == 3:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        _, img = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    data = pytesseract.image_to_data(img, lang=lang, config=OCR_CONFIG, output_type=Output.DICT)
+
+    with _OCR_CACHE_LOCK:
+        _OCR_CACHE[key] = data
+        if len(_OCR_CACHE) > OCR_CACHE_SIZE:
+            _OCR_CACHE.popitem(last=False)
+    return data
 
 def read_text(
     lang: str,
@@ -767,12 +1007,7 @@ def read_text(
     
     scr_bgr = screen(scope, is_debug = is_debug)
     
-    os.environ['TESSDATA_PREFIX'] = os.path.normpath(TESSDATA_PREFIX)
-    pytesseract.pytesseract.tesseract_cmd = r"C:/Program Files/Tesseract-OCR/tesseract.exe"
-
-    data = pytesseract.image_to_data(
-        scr_bgr, lang=lang, output_type=pytesseract.Output.DICT
-    )
+    data = _ocr(scr_bgr, lang)
 
     texts = [t.strip().lower() for t in data["text"]]
     LOGGER.debug(f"read texts: {texts}")
@@ -893,14 +1128,10 @@ def find_text(
         
         scr_bgr = screen(scope, is_debug = is_debug)
         
-        os.environ['TESSDATA_PREFIX'] = os.path.normpath(TESSDATA_PREFIX)
-        pytesseract.pytesseract.tesseract_cmd = r"C:/Program Files/Tesseract-OCR/tesseract.exe"
-
-        data = pytesseract.image_to_data(
-            scr_bgr, lang=lang, output_type=pytesseract.Output.DICT
-        )
+        data = _ocr(scr_bgr, lang)
 
-        texts = [t.strip().lower() for t in data["text"]]
+        # нижний регистр и замена похожих символов – один раз на слово, а не на каждое окно
+        texts = [replace_similar_chars(t.strip().lower()) for t in data["text"]]
         
         ocr_texts = [w for w in texts if w != ""]
         LOGGER.debug(f"OCR texts: {ocr_texts}")
@@ -908,13 +1139,9 @@ def find_text(
         if len(ocr_texts) == 0 and attempts == count:
             return None
 
-        n_boxes = len(texts)
-
-        for i in range(n_boxes - n_words + 1):
+        for i in _word_starts(data, n_words):
             window = texts[i:i + n_words]
             
-            window = [replace_similar_chars(w) for w in window]
-            
             if arrays_fuzzy_equal_as_one_str(window, query_words):
                 # Рассчитываем общий прямоугольник для всей последовательности
                 x_left = min(int(data["left"][j]) for j in range(i, i + n_words))
@@ -938,6 +1165,73 @@ def find_text(
     LOGGER.debug(f"Text '{query}' not found within {attempts} attempt")
     return None
 
+def _word_starts(data: dict, n_words: int) -> list[int]:
+    """
+    Индексы, с которых может начинаться окно из `n_words` слов: только строки
+    уровня «слово» (conf ≥ 0) с непустым текстом. Строки блоков/абзацев/линий
+    tesseract (conf = -1, пустой текст) отбрасываются одной векторной маской.
+    """
+    n_boxes = len(data["text"])
+    if n_boxes < n_words:
+        return []
+    conf = np.asarray(data["conf"], dtype=np.float32)
+    has_text = np.fromiter((bool(t.strip()) for t in data["text"]), dtype=bool, count=n_boxes)
+    keep = (conf >= 0) & has_text
+    keep[n_boxes - n_words + 1:] = False
+    return np.flatnonzero(keep).tolist()
+
+def _match_any(
+    texts: list[str],
+    data: dict,
+    queries_words: list[list[str]],
+    scope: tuple[int, int, int, int] | None,
+    is_debug: bool = False
+) -> tuple[int, int] | None:
+    """
+    Ищет в результате OCR первую последовательность слов из `queries_words`.
+    Возвращает абсолютные координаты центра совпадения или None.
+
+    :param texts: распознанные слова (strip + lower), по индексам совпадают с `data`
+    :param data:  результат ``pytesseract.image_to_data`` (Output.DICT)
+    :param scope: область, по которой делался OCR (для пересчёта в абсолютные координаты)
+    """
+    # Нормализуем распознанные слова один раз, а не в каждом окне
+    normalized_texts = [replace_similar_chars(w) for w in texts]
+
+    for query_words in queries_words:
+        # Нормализуем каждый токен в query
+        normalized_query = [replace_similar_chars(w) for w in query_words]
+        n_words = len(normalized_query)
+
+        # Сдвиг по позициям, где начинается распознанное слово
+        for i in _word_starts(data, n_words):
+            normalized_window = normalized_texts[i : i + n_words]
+
+            # Сравниваем через fuzzy (≥70% или порог внутри arrays_fuzzy_equal)
+            if arrays_fuzzy_equal_as_one_str(normalized_window, normalized_query):
+                # Вычисляем bounding box для всей последовательности
+                x_left = min(int(data["left"][j]) for j in range(i, i + n_words))
+                y_top = min(int(data["top"][j]) for j in range(i, i + n_words))
+                x_right = max(int(data["left"][j]) + int(data["width"][j]) for j in range(i, i + n_words))
+                y_bottom = max(int(data["top"][j]) + int(data["height"][j]) for j in range(i, i + n_words))
+
+                # Центр внутри обрезанного изображения (scope)
+                center_x_rel = (x_left + x_right) // 2
+                center_y_rel = (y_top + y_bottom) // 2
+
+                # Преобразуем в абсолютные координаты
+                scope_left, scope_top = (scope[0], scope[1]) if scope is not None else (0, 0)
+                abs_x = MON_X + scope_left + center_x_rel
+                abs_y = MON_Y + scope_top  + center_y_rel
+
+                if is_debug:
+                    LOGGER.debug(f"Found '{' '.join(query_words)}', " +
+                                 f"rel=({center_x_rel},{center_y_rel}), abs=({abs_x},{abs_y})")
+
+                return abs_x, abs_y
+
+    return None
+
 def find_text_any(
     queries: Iterable[str],
     lang: str,
@@ -969,16 +1263,8 @@ def find_text_any(
         # 1) Делаем скрин указанной области (screen уже учитывает MON_X/MON_Y внутри)
         scr_bgr = screen(scope=scope, process_for_read=process_for_read, is_debug=is_debug)
 
-        # 2) Настраиваем путь для Tesseract, если необходимо
-        os.environ['TESSDATA_PREFIX'] = os.path.normpath(TESSDATA_PREFIX)
-        pytesseract.pytesseract.tesseract_cmd = r"C:/Program Files/Tesseract-OCR/tesseract.exe"
-
-        # 3) Запускаем OCR
-        data = pytesseract.image_to_data(
-            scr_bgr,
-            lang=lang,
-            output_type=Output.DICT
-        )
+        # 2-3) Запускаем OCR (бинаризация + путь к Tesseract – внутри _ocr)
+        data = _ocr(scr_bgr, lang)
 
         # 4) Собираем массив распознанных слов и их конфиденвностей
         texts = []
@@ -1001,45 +1287,9 @@ def find_text_any(
             return None
 
         # 5) Перебираем каждую последовательность слов из queries_words
-        for query_words in queries_words:
-            # Нормализуем каждый токен в query
-            normalized_query = [replace_similar_chars(w) for w in query_words]
-            n_words = len(normalized_query)
-
-            # Сдвиг по всем возможным позициям в тексте
-            for i in range(0, n_boxes - n_words + 1):
-                window = texts[i : i + n_words]
-                #window_confs = confs[i : i + n_words]
-
-                # 5.1) Пропускаем, если хоть одно слово из окна слишком низкой уверенности
-                #if any(c < conf_threshold for c in window_confs):
-                #    continue
-
-                # 5.2) Нормализуем каждое слово в окне
-                normalized_window = [replace_similar_chars(w) for w in window]
-
-                # 5.3) Сравниваем через fuzzy (≥70% или порог внутри arrays_fuzzy_equal)
-                if arrays_fuzzy_equal_as_one_str(normalized_window, normalized_query):
-                    # 6) Вычисляем bounding box для всей последовательности
-                    x_left = min(int(data["left"][j]) for j in range(i, i + n_words))
-                    y_top = min(int(data["top"][j]) for j in range(i, i + n_words))
-                    x_right = max(int(data["left"][j]) + int(data["width"][j]) for j in range(i, i + n_words))
-                    y_bottom = max(int(data["top"][j]) + int(data["height"][j]) for j in range(i, i + n_words))
-
-                    # Центр внутри обрезанного изображения (scope)
-                    center_x_rel = (x_left + x_right) // 2
-                    center_y_rel = (y_top + y_bottom) // 2
-
-                    # 7) Преобразуем в абсолютные координаты
-                    scope_left, scope_top = (scope[0], scope[1]) if scope is not None else (0, 0)
-                    abs_x = MON_X + scope_left + center_x_rel
-                    abs_y = MON_Y + scope_top  + center_y_rel
-
-                    if is_debug:
-                        LOGGER.debug(f"Found '{' '.join(query_words)}' at attempt {attempts}, " +
-                                     f"rel=({center_x_rel},{center_y_rel}), abs=({abs_x},{abs_y})")
-
-                    return abs_x, abs_y
+        pos = _match_any(texts, data, queries_words, scope, is_debug=is_debug)
+        if pos:
+            return pos
                 
         pause(pause_attempt_sec)
 
@@ -1049,6 +1299,45 @@ def find_text_any(
     LOGGER.debug(f"None of texts {queries} found after {attempts} attempts")
     return False
 
+def find_texts_parallel(
+    probes: list[tuple[Iterable[str], tuple[int, int, int, int]]],
+    lang: str,
+    is_debug: bool = False
+) -> list[tuple[int, int] | None]:
+    """
+    Несколько OCR-проб по одному кадру.
+
+    Экран снимается один раз (общая рамка всех scope), каждая уникальная
+    область распознаётся в своём потоке – tesseract.exe работает вне GIL.
+    Пробы с одинаковым scope делят один результат OCR.
+
+    :param probes: список пар (queries, scope) – как у `find_text_any`
+    :return:       для каждой пробы координаты центра найденного текста или None
+    """
+    left = min(scope[0] for _, scope in probes)
+    top = min(scope[1] for _, scope in probes)
+    right = max(scope[2] for _, scope in probes)
+    bottom = max(scope[3] for _, scope in probes)
+    frame = screen((left, top, right, bottom), is_debug=is_debug)
+
+    def _ocr_scope(scope: tuple[int, int, int, int]) -> dict:
+        x1, y1, x2, y2 = scope
+        crop = np.ascontiguousarray(frame[y1 - top:y2 - top, x1 - left:x2 - left])
+        return _ocr(crop, lang)
+
+    scopes = list(dict.fromkeys(scope for _, scope in probes))
+    ocr_by_scope = dict(zip(scopes, SHARED_POOL.map(_ocr_scope, scopes)))
+
+    results: list[tuple[int, int] | None] = []
+    for queries, scope in probes:
+        data = ocr_by_scope[scope]
+        texts = [t.strip().lower() for t in data["text"]]
+        queries_words = [q.lower().split() for q in queries]
+        results.append(_match_any(texts, data, queries_words, scope, is_debug=is_debug))
+
+    LOGGER.debug(f"parallel probes {[list(q) for q, _ in probes]}: {results}")
+    return results
+
 def cursor_move_to(
     x: int = 500,
     y: int = 500
@@ -1069,9 +1358,77 @@ def contrlScroll(amount:int):
     time.sleep(1)
     # Отпускаем Ctrl
     pag.keyUp('ctrl')
-    
-    time.sleep(1) 
-    
+
+    time.sleep(1)
+
+# ---------------------------------------------------------------------------
+# SendInput: пакет клавиш одним системным вызовом (без PAUSE pyautogui)
+# ---------------------------------------------------------------------------
+_INPUT_KEYBOARD = 1
+_KEYEVENTF_KEYUP = 0x0002
+_KEYEVENTF_UNICODE = 0x0004
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD),
+                ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t)]
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", wintypes.DWORD), ("wParamL", wintypes.WORD),
+                ("wParamH", wintypes.WORD)]
+
+class _INPUTUNION(ctypes.Union):
+    # union должен иметь размер MOUSEINPUT, иначе SendInput отвергнет cbSize
+    _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT), ("hi", _HARDWAREINPUT)]
+
+class _INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+def send_keys_batch(events: Iterable[tuple[str, int]]) -> int:
+    """
+    Отправляет последовательность нажатий одним вызовом ``user32.SendInput``.
+
+    :param events: список кортежей ``('key_down'|'key_up', vk_code)`` или
+                   ``('char_down'|'char_up', utf16_code_unit)`` – символ
+                   без учёта раскладки клавиатуры
+    :return: количество событий, принятых системой
+    """
+    events = list(events)
+    inputs = (_INPUT * len(events))()
+    for inp, (action, code) in zip(inputs, events):
+        inp.type = _INPUT_KEYBOARD
+        flags = _KEYEVENTF_KEYUP if action.endswith("_up") else 0
+        if action.startswith("char_"):
+            inp.ki.wScan = code
+            flags |= _KEYEVENTF_UNICODE
+        else:
+            inp.ki.wVk = code
+        inp.ki.dwFlags = flags
+
+    sent = ctypes.windll.user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT))
+    if sent != len(inputs):
+        LOGGER.warning(f"SendInput accepted {sent} of {len(inputs)} events")
+    return sent
+
+def fast_type(text: str) -> int:
+    """
+    Вводит строку одним пакетом SendInput (KEYEVENTF_UNICODE): без буфера
+    обмена и без зависимости от текущей раскладки – латиница и кириллица
+    вводятся одинаково.
+    """
+    raw = text.encode("utf-16-le")
+    events: list[tuple[str, int]] = []
+    for i in range(0, len(raw), 2):
+        unit = int.from_bytes(raw[i:i + 2], "little")
+        events += [("char_down", unit), ("char_up", unit)]
+    return send_keys_batch(events)
+
 def remove_green_background(src_bgr: np.ndarray) -> np.ndarray:
     """
     Превращает зелёные блоки в чисто-белый фон, оставляя текст (и всё остальное) нетронутым.
@@ -1152,8 +1509,9 @@ def unsharp_mask(src_bgr: np.ndarray,
 def preprocess_for_ocr(src_bgr: np.ndarray) -> np.ndarray:
     """
     1) Удаляет зелёный фон (вызывая remove_green_background)
-    2) Конвертирует в серый + CLAHE (локальное выравнивание гистограммы)
+    2) Конвертирует в серый + шумоподавление + CLAHE (локальное выравнивание гистограммы)
     3) Адаптивную бинаризацию (чёрно-белое)
+    Возвращает одноканальное изображение – меньше данных для анализа layout в tesseract.
     """
     # 1) Убираем зелёный фон
     no_green = unsharp_mask(remove_green_background(src_bgr))
@@ -1161,11 +1519,14 @@ def preprocess_for_ocr(src_bgr: np.ndarray) -> np.ndarray:
     # 2) В оттенки серого
     gray = cv2.cvtColor(no_green, cv2.COLOR_BGR2GRAY)
 
-    # 3) CLAHE для повышения контраста
+    # 3) Шумоподавление до CLAHE, иначе выравнивание усиливает шум после unsharp_mask
+    gray = cv2.fastNlMeansDenoising(gray, h=10)
+
+    # 4) CLAHE для повышения контраста
     clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
     equalized = clahe.apply(gray)
 
-    # 4) Адаптивная бинаризация (локальная) — чаще всего лучше, чем просто Otsu
+    # 5) Адаптивная бинаризация (локальная) — чаще всего лучше, чем просто Otsu
     bw = cv2.adaptiveThreshold(
         equalized,
         255,
@@ -1181,11 +1542,8 @@ def find_first_free_slot_in_day_week(scope: tuple[int,int,int,int],
                                     ) -> tuple[int,int] | None:
 
     # 1) Захват экрана + конверсия BGRA→BGR→HSV
-    with mss.mss() as sct:
-        mon = _get_monitor_region(scope)
-        img = sct.grab(mon)
-        bgr = np.array(img)[..., :3]
-        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    bgr = cv2.cvtColor(_grab_bgra(scope), cv2.COLOR_BGRA2BGR)
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
 
     if is_debug:
         show_image(bgr)
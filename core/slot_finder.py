@@ -20,28 +20,36 @@ ok = SlotFinder().work(user_cfg)
 from __future__ import annotations
 
 import os
-import re
-import datetime as _dt
+import threading
 from datetime import date, datetime, timedelta
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 import pytesseract
+from PIL import Image
+
+try:
+    # постоянный движок OCR: без запуска tesseract.exe и перезагрузки модели на каждый кадр
+    import tesserocr
+except ImportError:  # fallback – pytesseract (новый процесс на каждый вызов)
+    tesserocr = None
 
 import pyautogui as pag
-import pyperclip
 
 from core import gui_driver as gd
 from utils.logger import setup_logger
 from bot_io.yaml_loader import UserConfig, YAMLLoader
-from project_config import (LOG_LEVEL, USERS_DIR,
+from project_config import (LOG_LEVEL, USERS_DIR, TESSDATA_PREFIX,
                             VISIT_CHECK_DAY_TEMPLATE_PATH, VISIT_CHECK_WEEK_TEMPLATE_PATH,
                             VISIT_CHECK_MONTH_TEMPLATE_PATH)
 
-from datetime import datetime
 from babel.dates import format_date
 from typing import Dict, Tuple, List
 
-from utils.logger import setup_logger
+from core.date_slots import parse_date_slots
 from core.free_slot_db import FreeSlotRegistry
 from core.gui_driver import find_text, pause, reload_page
 from server.tcp_server import ControlServer, PAUSE_EVT, STOP_EVT
@@ -82,25 +90,95 @@ IMG_BTN_RELOAD_PAGE = "reload_page.png"
 IMG_BTN_MAKE_APPOINT_VISIT = "make_appoint_visit.png"
 IMG_BTN_QUEUE = "queue.png"
 
+FORM_SCOPE = (130, 440, 1000, 900)  # поля мастера: страна, консульство, услуга
+SLOTS_STATUS_SCOPE = (160, 400, 1000, 620)  # «На жаль» / «пошук активних»
+
+OCR_CACHE_SIZE = 16  # кадров панели слотов в LRU-кэше OCR
+
 WEEK_DAYS = ["понеділок","вівторок","середа","четвер","п'ятниця","субота","неділя"]
 MONTHS = ["січень", "лютий", "березень", "квітень", "травень", "червень", "липень", "серпень", "вересень", "жовтень", "листопад", "грудень"]
 
 # ---------------------------------------------------------------------------
-# # SlotFinder implementation
+# OCR engine for the slots panel
 # ---------------------------------------------------------------------------
-LOGGER = setup_logger(__name__)
+_TESS_LOCK = threading.Lock()
+_TESS = None
+
+# На панели только даты, «-», числа и «ВІЛЬНИХ СЛОТІВ»: разреженный текст (PSM 11)
+# без анализа макета и узкий алфавит – меньше кандидатов у распознавателя.
+OCR_SLOTS_WHITELIST = "0123456789.-ВІЛЬНИХСЛОТ"
+OCR_SLOTS_CONFIG = f"--psm 11 -c tessedit_char_whitelist={OCR_SLOTS_WHITELIST}"
+
+# OCR панели слотов идёт в фоне, пока основной поток возвращает масштаб страницы.
+# Потоки, а не процессы: tesserocr и tesseract.exe отпускают GIL, а кадр не нужно
+# сериализовать в другой процесс. Один воркер – движок _TESS всё равно один.
+_OCR_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr")
+
+# путь к tesseract.exe и TESSDATA_PREFIX задаёт core.gui_driver при импорте
+
+if tesserocr is not None:
+    try:
+        _TESS = tesserocr.PyTessBaseAPI(path=os.path.normpath(TESSDATA_PREFIX),
+                                        lang="ukr", psm=tesserocr.PSM.SPARSE_TEXT)
+        _TESS.SetVariable("tessedit_char_whitelist", OCR_SLOTS_WHITELIST)
+    except RuntimeError as exc:
+        LOGGER.warning("tesserocr init failed, fallback to pytesseract: %s", exc)
+        _TESS = None
+
 
+def _ocr_words(image) -> dict[str, list]:
+    """
+    OCR кадра по словам. Возвращает словарь в формате
+    ``pytesseract.Output.DICT`` (text / conf / left / top / width / height).
+    """
+    if _TESS is None:
+        return pytesseract.image_to_data(image, lang="ukr", config=OCR_SLOTS_CONFIG,
+                                         output_type=pytesseract.Output.DICT)
+
+    # BGR → RGB; бинаризованный кадр (2D) передаём как есть
+    pil_image = Image.fromarray(image if image.ndim == 2 else image[..., ::-1])
+    data: dict[str, list] = {"text": [], "conf": [], "left": [], "top": [],
+                             "width": [], "height": []}
+    level = tesserocr.RIL.WORD
+    with _TESS_LOCK:
+        _TESS.SetImage(pil_image)
+        _TESS.Recognize()
+        for word in tesserocr.iterate_level(_TESS.GetIterator(), level):
+            text = word.GetUTF8Text(level)
+            box = word.BoundingBox(level)
+            if text is None or box is None:
+                continue
+            x1, y1, x2, y2 = box
+            data["text"].append(text)
+            data["conf"].append(word.Confidence(level))
+            data["left"].append(x1)
+            data["top"].append(y1)
+            data["width"].append(x2 - x1)
+            data["height"].append(y2 - y1)
+    return data
+
+
+@lru_cache(maxsize=12)
+def _uk_month_genitive(month: int) -> str:
+    """Название месяца в родительном падеже («1 червня» → «червня»), как в календаре сайта."""
+    return format_date(date(2000, month, 1), format='d MMMM', locale='uk').split()[1]
+
+# ---------------------------------------------------------------------------
+# # SlotFinder implementation
+# ---------------------------------------------------------------------------
 free_slots = FreeSlotRegistry()
 
 class SlotFinder:
     """Encapsulates wizard navigation and calendar scanning."""
-    
-    slots_found = []
 
     def __init__(self, fast_delay: float = 0.4, slow_delay: float = 1.2, s_slow_delay: float = 4.8):
         self.fast = fast_delay  # small waits between field fills
         self.slow = slow_delay  # waits for page loads
         self.s_slow = s_slow_delay  # waits for page loads
+        # frame_hash кадра панели → результат parse_date_slots
+        self._ocr_cache: OrderedDict[int, List[Tuple[str, str, int]]] = OrderedDict()
+        # уже сообщённые слоты (alias, consulate, service, date, time) – повторы OCR не логируем
+        self.slots_found: set[tuple[str, str, str, date, str]] = set()
 
     # ------------------------------------------------------------------
     def work(self, user: UserConfig) -> bool:  # noqa: C901 (complexity OK here)
@@ -136,13 +214,17 @@ class SlotFinder:
             return self._find_slots(user)
         
         except Exception as exc:  # noqa: BLE001
-            scr = gd.take_screenshot()
+            scr = gd.lazy_screenshot()
             _error_hook(f"Exception in SlotFinder: {exc}", scr)
             return False
         
     # ------------------------------------------------------------------
     # Heloers
     # ------------------------------------------------------------------
+
+    def _settle(self) -> None:
+        """Короткая пауза в цепочке клавиш: до остановки анимации формы, не дольше 2×fast."""
+        gd.wait_until_stable(FORM_SCOPE, interval=0.08, timeout=self.fast * 2)
     
     def _is_login(self) -> bool:
             LOGGER.debug("check is login")
@@ -240,7 +322,7 @@ class SlotFinder:
             lang="ukr", 
             scope=(730, 554, 1300, 790), is_debug=is_debug):
             
-                _error_hook("field i_no_robot missing", gd.take_screenshot())
+                _error_hook("field i_no_robot missing", gd.lazy_screenshot())
                 return False
         return True
         
@@ -258,37 +340,36 @@ class SlotFinder:
             lang="ukr", 
             scope=(170, 640, 360, 680)):
             
-            _error_hook("field country missing", gd.take_screenshot())
+            _error_hook("field country missing", gd.lazy_screenshot())
             return False
         
-        gd.pause(self.fast)
+        self._settle()
         
-        pyperclip.copy(country)
-        gd.pause(self.fast)
-        pag.hotkey('ctrl', 'v')
+        gd.fast_type(country)
+        # поле с автодополнением – даём подсказке появиться до Enter
         gd.pause(self.fast)
         pag.press('enter')
-        gd.pause(self.fast)
+        self._settle()
         pag.press('tab')
-        
-        pyperclip.copy(cons)
+        # поле консульства заполняется по выбранной стране – ждём, пока оно станет доступно
         gd.pause(self.slow)
-        pag.hotkey('ctrl', 'v')
+        
+        gd.fast_type(cons)
         gd.pause(self.slow)
         pag.press('enter')
         gd.pause(self.slow)
         
         pag.press('tab')
-        gd.pause(self.fast)
+        self._settle()
         pag.press('tab')
-        gd.pause(self.fast)
+        self._settle()
         pag.press('enter')
         gd.pause(self.slow)
         gd.pause(self.slow)
         
         # if not gd.click_image(IMG_BTN_DALI, scope=(376, 720, 560, 900), plus_y= 50, plus_x=-30):
             
-        #     _error_hook("button image Next after type cons missing", gd.take_screenshot())
+        #     _error_hook("button image Next after type cons missing", gd.lazy_screenshot())
         #     return False
         
         if not self.is_appointment_visit():
@@ -313,14 +394,12 @@ class SlotFinder:
                 scope=(130, 470, 390, 550), is_debug=False)
         if not pos:
                 
-                _error_hook("field check consulate for myself missing", gd.take_screenshot())
+                _error_hook("field check consulate for myself missing", gd.lazy_screenshot())
                 return False
         
-        gd.pause(self.fast)
-        LOGGER.debug(f"copy to clipboard {consular_service}")
-        pyperclip.copy(consular_service)
-        gd.pause(self.fast)
-        pag.hotkey('ctrl', 'v')
+        self._settle()
+        LOGGER.debug(f"type {consular_service}")
+        gd.fast_type(consular_service)
         gd.pause(self.slow)
         LOGGER.debug(f"press enter")
         pag.press('enter')
@@ -331,7 +410,7 @@ class SlotFinder:
             LOGGER.debug("find check for myself")
             is_checked = gd.detect_checkbox_type_from_frame(scope=(180, 610, 220, 650), is_debug=False)
             if is_checked == "none":
-                _error_hook("field check consulate for myself missing", gd.take_screenshot())
+                _error_hook("field check consulate for myself missing", gd.lazy_screenshot())
                 return False
             elif is_checked == "empty":
                 LOGGER.debug("check for myself not found, try to click text")
@@ -339,14 +418,14 @@ class SlotFinder:
                     lang="ukr", 
                     scope=(140, 600, 600, 650)):
                 
-                    _error_hook("field check consulate for myself missing", gd.take_screenshot())
+                    _error_hook("field check consulate for myself missing", gd.lazy_screenshot())
                     return False
 
         else:
             LOGGER.debug("find check for children")
             is_checked = gd.detect_checkbox_type_from_frame(scope=(180, 675, 220, 720), is_debug=False)
             if is_checked == "none":
-                _error_hook("field check consulate for myself missing", gd.take_screenshot())
+                _error_hook("field check consulate for myself missing", gd.lazy_screenshot())
                 return False
             elif is_checked == "empty":
                 LOGGER.debug("check for children not found, try to click text")   
@@ -354,18 +433,18 @@ class SlotFinder:
                     lang="ukr", 
                     scope=(180, 675, 220, 720)):
                     
-                    _error_hook("field check consulate for myself missing", gd.take_screenshot())
+                    _error_hook("field check consulate for myself missing", gd.lazy_screenshot())
                     return False
         
             else:
                 LOGGER.debug("check for children checked")
         
                 
-        gd.pause(self.fast)
+        self._settle()
         
         LOGGER.debug("click Dali")
         if not gd.click_image(name = IMG_BTN_DALI, scope=(370, 740, 570, 840)):
-            _error_hook("button image Next after type cons missing", gd.take_screenshot())
+            _error_hook("button image Next after type cons missing", gd.lazy_screenshot())
             return False
     
         return True
@@ -397,7 +476,7 @@ class SlotFinder:
                             scope=(100, 500, 400, 700)):
         
                 
-                    _error_hook("birthdate field day missing", gd.take_screenshot())
+                    _error_hook("birthdate field day missing", gd.lazy_screenshot())
                     return False
                 
         if STOP_EVT.is_set():
@@ -412,13 +491,12 @@ class SlotFinder:
                         count_attempt_find=2,
                         lang="ukr", 
                         scope=(260, 520, 400, 570), is_debug=False):
-            _error_hook("birthdate field month missing", gd.take_screenshot())
+            _error_hook("birthdate field month missing", gd.lazy_screenshot())
             return False
         
         gd.pause(self.fast)
         
-        formatted = format_date(user.birthdate, format='d MMMM', locale='uk')
-        month_in_genitive = formatted.split()[1]
+        month_in_genitive = _uk_month_genitive(user.birthdate.month)
         
         if not gd.click_text(month_in_genitive, 
                         lang="ukr", 
@@ -434,14 +512,14 @@ class SlotFinder:
                 lang="ukr", 
                 scope=(200, 500, 500, 1160), is_debug=False):
     
-                _error_hook("birthdate field number month missing", gd.take_screenshot())
+                _error_hook("birthdate field number month missing", gd.lazy_screenshot())
                 return False
             
         
         if not gd.click_text("рік", 
                     lang="ukr", 
                     scope=(480, 500, 600, 600)):
-            _error_hook("birthdate field year missing", gd.take_screenshot())
+            _error_hook("birthdate field year missing", gd.lazy_screenshot())
             return False
         
         gd.pause(self.fast)
@@ -458,13 +536,13 @@ class SlotFinder:
             if not gd.click_text("Чоловіча", 
                     lang="ukr", 
                     scope=(190, 400, 490, 910)):
-                _error_hook("gender field missing", gd.take_screenshot())
+                _error_hook("gender field missing", gd.lazy_screenshot())
                 return False
         else:
             if not gd.click_text("Жіноча", 
                 lang="ukr", 
                 scope=(190, 400, 490, 910)):
-                _error_hook("gender field missing", gd.take_screenshot())
+                _error_hook("gender field missing", gd.lazy_screenshot())
                 return False
             
         gd.pause(self.fast)
@@ -475,7 +553,7 @@ class SlotFinder:
         LOGGER.debug("Find and click Dali")
         if not gd.click_image(IMG_BTN_DALI, scope=(190, 760, 500, 860), 
                               is_debug=False, multiscale=False, confidence=0.6):
-            _error_hook("button image Next after gender missing", gd.take_screenshot())
+            _error_hook("button image Next after gender missing", gd.lazy_screenshot())
             return False
         
         gd.pause(self.slow)
@@ -489,7 +567,7 @@ class SlotFinder:
         if not gd.click_text("зараз немає вільного часу", 
                 lang="ukr", 
                 scope=(160, 490, 1100, 620)):
-                _error_hook("gender field missing", gd.take_screenshot())
+                _error_hook("gender field missing", gd.lazy_screenshot())
                 return False
             
     def is_page_select_place_visit(self):
@@ -586,7 +664,7 @@ class SlotFinder:
                 
             gd.pause(self.slow)
             if not self.is_page_select_place_visit():
-                _error_hook("back_to_select_country fault", gd.take_screenshot())
+                _error_hook("back_to_select_country fault", gd.lazy_screenshot())
                 return False
 
         self.clear_country(country)
@@ -639,7 +717,7 @@ class SlotFinder:
                 
             gd.pause(self.slow)
             if not self.is_page_select_service():
-                _error_hook("back_to_select_service fault", gd.take_screenshot())
+                _error_hook("back_to_select_service fault", gd.lazy_screenshot())
                 return False
         
         gd.pause(self.s_slow)
@@ -677,36 +755,35 @@ class SlotFinder:
             return None
         
         count = 0
+        # общий лимит – прежний худший случай (20 попыток по 3 × s_slow), а не число
+        # попыток: анимация в области статуса может быстро «съесть» любое их количество
+        deadline = time.monotonic() + 60 * self.s_slow
         
-        while count < 20:
+        while True:
             LOGGER.debug(f"attempt {count}")            
             count += 1
             
-            if gd.find_text("На жаль", 
-                lang="ukr", 
-                scope=(160, 400, 1000, 620), is_debug=False):
-                
+            # обе надписи в одной области – один кадр и один OCR на попытку
+            no_slots, searching = gd.find_texts_parallel(
+                [(["На жаль"], SLOTS_STATUS_SCOPE),
+                 (["пошук активних"], SLOTS_STATUS_SCOPE)],
+                lang="ukr")
+
+            if no_slots:
                 YAMLLoader.record_service_status(user, consulate, service, status="unavailable", comment="На жаль немає вільних слотів")
                 self.to_back(user.country, service)
                 return None
             
-            if not gd.find_text("пошук активних", 
-                lang="ukr", 
-                scope=(160, 400, 1000, 620), is_debug=False):
-                
-                if gd.find_text("На жаль", 
-                    lang="ukr", 
-                    scope=(160, 400, 1000, 620), is_debug=False):
-                    
-                    self.to_back(country, service)
-                    return None
-                
+            if not searching:
                 return True
             
-            gd.pause(self.s_slow)
-            gd.pause(self.s_slow)
-            gd.pause(self.s_slow)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             
+            # пока идёт поиск, OCR не нужен: ждём смены содержимого области
+            gd.wait_for_pixel_change(SLOTS_STATUS_SCOPE, interval=0.3, timeout=min(60.0, remaining))
+            gd.pause(self.fast)
                
         return False
 
@@ -726,68 +803,6 @@ class SlotFinder:
         gd.human_move(1480, 480)
         gd.pause(self.s_slow)
         
-    def normalize_date_token(self, tok: str) -> str:
-        """
-        Нормализует «кривые» даты вида:
-        - заменяет кириллическую «З» или латинскую «Z» на цифру «3»
-        - если осталось «0.mm.yyyy» (односимвольный день «0»), преобразует в «30.mm.yyyy»
-        """
-        t = tok.strip()
-
-        # 1) Заменяем кириллическую З или латинскую Z на цифру 3
-        t = t.replace('З', '3').replace('z', '3').replace('Z', '3')
-
-        # 2) Если получилось «0.mm.yyyy» (без ведущей цифры дня), добавляем «3» спереди
-        #    Напр.: «0.06.2025» → «30.06.2025»
-        if re.fullmatch(r'0\.\d{2}\.\d{4}', t):
-            t = '30' + t[1:]
-
-        return t
-
-    def normalize_tokens(self, tokens: List[str]) -> List[str]:
-        """
-        Применяет normalize_date_token ко всем токенам в списке.
-        """
-        return [self.normalize_date_token(tok) for tok in tokens]
-
-    def parse_date_slots(self, tokens: List[str]) -> List[Tuple[str, str, int]]:
-        """
-        Из списка токенов (после нормализации) собирает кортежи
-        (start_date, end_date, slots_count).
-        """
-        
-        tokens = self.normalize_tokens(tokens)
-        
-        date_re = re.compile(r'^\d{2}\.\d{2}\.\d{4}$')
-        result: List[Tuple[str, str, int]] = []
-        i = 0
-        n = len(tokens)
-
-        while i < n:
-            if (i + 2 < n 
-                and date_re.match(tokens[i])
-                and tokens[i+1] == "-"
-                and date_re.match(tokens[i+2])
-                ):
-                    start_date, end_date = tokens[i], tokens[i+2]
-                    # ищём число после диапазона
-                    j = i + 3
-                    while j < n:
-                        tok = tokens[j].strip()
-                        if tok.isdigit():
-                            slots_count = int(tok)
-                            break
-                        j += 1
-                    else:
-                        slots_count = None
-
-                    if slots_count is not None:
-                        result.append((start_date, end_date, slots_count))
-            
-            i += 1
-
-        return result
-
     def extract_slots_info(self, is_debug: bool = False) -> list[dict]:
         """
         Сквозная обработка скрина: ищем все строки вида "<число> ВІЛЬНИХ СЛОТІВ",
@@ -809,28 +824,39 @@ class SlotFinder:
         gd.contrlScroll(300)
         gd.pause(self.slow)
         gd.pause(self.slow)
-        pytesseract.pytesseract.tesseract_cmd = r"C:/Program Files/Tesseract-OCR/tesseract.exe"
         
         image_bgr = gd.screen(scope = (100,180,470,1020), is_debug=is_debug, process_for_read = True)
-        
+
+        # 0) Кадр не изменился с прошлого скана – OCR не нужен,
+        #    иначе запускаем OCR в фоне и параллельно возвращаем масштаб
+        key = gd.frame_hash(image_bgr)
+        future = None
+        if key not in self._ocr_cache:
+            future = _OCR_POOL.submit(_ocr_words, image_bgr)
+
         gd.contrlScroll(-300)
         gd.pause(self.slow)
         gd.contrlScroll(-300)
         gd.pause(self.slow)
         gd.contrlScroll(-300)
         gd.pause(self.slow)
-        
+
+        if future is None:
+            self._ocr_cache.move_to_end(key)
+            results = self._ocr_cache[key]
+            LOGGER.debug(f"results parse_date_slots (cached frame): {results}")
+            return results
+
         # 1) Получаем данные OCR (каждое слово + координаты)
-        #    output_type=DICT вернёт словарь со списками для каждого атрибута
-        ocr_data = pytesseract.image_to_data(
-            image_bgr,
-            lang='ukr',                       # язык украинский (добавьте при необходимости 'ukr' в Tesseract)
-            output_type=pytesseract.Output.DICT
-        )
+        ocr_data = future.result()
 
-        LOGGER.debug(f"parse_date_slots ocr texts: {ocr_data["text"]}")
-        results =  self.parse_date_slots(ocr_data["text"])      
+        LOGGER.debug(f"parse_date_slots ocr texts: {ocr_data['text']}")
+        results =  parse_date_slots(ocr_data["text"], ocr_data["conf"])
         LOGGER.debug(f"results parse_date_slots: {results}")
+
+        self._ocr_cache[key] = results
+        if len(self._ocr_cache) > OCR_CACHE_SIZE:
+            self._ocr_cache.popitem(last=False)
         return results
     
     def find_first_free_slot_in_day_week(self, user: UserConfig, consulate:str, service:str, dt: date, scope: tuple[int, int, int, int] = None) ->bool|None:
@@ -842,14 +868,17 @@ class SlotFinder:
                 time_slot = gd.read_text("ukr", scope = (x, y, x + 120, y + 40))
                 LOGGER.debug(f"найден свободный слот {time_slot}")
                 
-                _slot_found(user.alias, user.country, consulate, service, dt, time_slot)
+                slot_key = (user.alias, consulate, service, dt, str(time_slot))
+                if slot_key not in self.slots_found:
+                    self.slots_found.add(slot_key)
+                    _slot_found(user.alias, user.country, consulate, service, dt, time_slot)
                 
                 gd.click(x + 60, y + 20)
                 gd.pause(self.fast)
                 gd.scroll(-3000)
        
                 if not gd.click_image(IMG_BTN_CONFIRM, confidence=0.6, scope=(376, 720, 640, 900), plus_y=20):
-                        _error_hook("button CONFIRM slot missing", gd.take_screenshot())
+                        _error_hook("button CONFIRM slot missing", gd.lazy_screenshot())
                         return None
                     
                 gd.pause(self.slow)
@@ -857,7 +886,7 @@ class SlotFinder:
                 if not self.i_no_robot(count_attempt_find=1, is_debug=False):
                     
                     if not gd.click_image(IMG_BTN_CONFIRM, confidence=0.6, scope=(376, 720, 640, 900), plus_y=20):
-                        _error_hook("button CONFIRM slot missing", gd.take_screenshot())
+                        _error_hook("button CONFIRM slot missing", gd.lazy_screenshot())
                         pass
                     
                     if not self.i_no_robot(is_debug=False):
@@ -867,11 +896,11 @@ class SlotFinder:
                 
                 if not self.is_success_blocked_slot():
                     
-                    _error_hook("no blocked slot", gd.take_screenshot())
+                    _error_hook("no blocked slot", gd.lazy_screenshot())
                     return None
                 
                 if not gd.click_image(IMG_BTN_ITS_CLEAR, scope=(800, 650, 1100, 750)):
-                        _error_hook("button ITS CLEAR after blocked slot missing", gd.take_screenshot())
+                        _error_hook("button ITS CLEAR after blocked slot missing", gd.lazy_screenshot())
                         return None
                 
                 YAMLLoader.record_service_status(user, consulate, service, status="booked", date=dt, time_=time_slot)
@@ -944,7 +973,7 @@ class SlotFinder:
                         y_min = y
                         stop = True
                 else:
-                    _error_hook(f"не найдена {WEEK_DAYS[number_day]}", gd.take_screenshot())
+                    _error_hook(f"не найдена {WEEK_DAYS[number_day]}", gd.lazy_screenshot())
                     return None
                 
         LOGGER.debug(f"найдены границы {WEEK_DAYS[number_day]} - y_min:{y_min} y_max:{y_max}, скролл окончен, можно искать слоты")
@@ -959,7 +988,7 @@ class SlotFinder:
             lang="ukr", 
             scope=(160, 160, 340, 740), is_debug=False):
             
-            _error_hook("not found date_min_week", gd.take_screenshot())
+            _error_hook("not found date_min_week", gd.lazy_screenshot())
             return False
         
         gd.pause(self.fast)
@@ -1015,19 +1044,30 @@ class SlotFinder:
         month_data = self.extract_slots_info(is_debug = False)
         
         is_found = False
+        
+        # ранние недели первыми – первый забронированный слот и есть самый ранний,
+        # остальные недели после успеха не открываем
+        # неверно распознанная дата пропускает только свою неделю, а не весь месяц
+        weeks = []
+        for date_min_week_str, _date_max_week_str, count_slots in month_data:
+            try:
+                date_min_week = datetime.strptime(date_min_week_str, "%d.%m.%Y").date()
+            except (TypeError, ValueError):
+                LOGGER.debug(f"skip week with unreadable date {date_min_week_str!r}")
+                continue
+            weeks.append((date_min_week, date_min_week_str, count_slots))
+        weeks.sort()
          
-        for week_data in month_data:
+        for date_min_week, date_min_week_str, count_slots in weeks:
             if STOP_EVT.is_set():
                     return False
-            date_min_week_str, date_max_week_str, count_slots = week_data
-            date_min_week = datetime.strptime(date_min_week_str, "%d.%m.%Y").date()
             if count_slots > 0 and user.min_date >= date_min_week:
                 
                 free_slots.add(user.country, consulate, service, date_min_week_str)
                 gd.pause(self.slow)
                 is_found = self.find_free_slot_week(user, consulate, service, date_min_week_str, date_min_week)
                 
-                if is_found == None:
+                if is_found or is_found == None:
                     break
                 
         return is_found
@@ -1088,7 +1128,7 @@ class SlotFinder:
                     lang="ukr", 
                     scope=(300, 500, 1000, 640), is_debug=False):
                 
-                    _error_hook(f"not find button month {current_month_name}", gd.take_screenshot())
+                    _error_hook(f"not find button month {current_month_name}", gd.lazy_screenshot())
                     
             gd.pause(self.s_slow)
             gd.pause(self.s_slow)
@@ -1117,7 +1157,7 @@ class SlotFinder:
                              lang="ukr", 
                              scope=(600, 420, 940, 720), is_debug=False):
             
-            _error_hook("personal login button not found", gd.take_screenshot())
+            _error_hook("personal login button not found", gd.lazy_screenshot())
             return False
             
         gd.pause(self.slow)
@@ -1127,25 +1167,18 @@ class SlotFinder:
                              lang="ukr",
                              scope=(700, 420, 1200, 620)):
             
-            _error_hook("personal select key button not found", gd.take_screenshot())
+            _error_hook("personal select key button not found", gd.lazy_screenshot())
         
         gd.pause(self.slow)
         LOGGER.debug(f"user.key_path: {user.key_path}")
-        pyperclip.copy(user.key_path)
-        gd.pause(self.fast)
-        pyperclip.copy(user.key_path)
-        gd.pause(self.fast)
-        pag.hotkey('ctrl', 'v')
+        gd.fast_type(str(user.key_path))
+        # диалог выбора файла должен принять путь до Enter
         gd.pause(self.slow)
         pag.press('enter')
         gd.pause(self.slow)
-                
+
         LOGGER.debug(f"paste pass")
-        pyperclip.copy(user.key_password)
-        gd.pause(self.fast)
-        pyperclip.copy(user.key_password)
-        gd.pause(self.fast)
-        pag.hotkey('ctrl', 'v')
+        gd.fast_type(user.key_password)
         gd.pause(self.slow)
         pag.press('enter')
         gd.pause(self.slow)
@@ -1160,7 +1193,7 @@ class SlotFinder:
         if self._is_login():
             return True 
 
-        _error_hook("Error login", gd.take_screenshot())
+        _error_hook("Error login", gd.lazy_screenshot())
         return False
 
     def wait_process_check(self) -> bool|None:
@@ -1218,7 +1251,7 @@ class SlotFinder:
         if not gd.click_text("Запис на візит", 
                              lang="ukr", 
                              scope=(560, 100, 690, 160), is_debug=False):
-                    _error_hook("btn visit wizard not found", gd.take_screenshot())
+                    _error_hook("btn visit wizard not found", gd.lazy_screenshot())
                     
                     gd.reload_page()
                     
@@ -1229,7 +1262,7 @@ class SlotFinder:
                             lang="ukr", 
                             scope=(560, 100, 690, 160)):
                         
-                        _error_hook("btn visit wizard not found", gd.take_screenshot())
+                        _error_hook("btn visit wizard not found", gd.lazy_screenshot())
                         return False
                 
         gd.pause(self.s_slow)
@@ -1259,7 +1292,7 @@ class SlotFinder:
                             plus_y=-40,
                             scope=(140, 240, 540, 360), is_debug=False):
             
-                _error_hook("btn visit wizard 2 not found", gd.take_screenshot())
+                _error_hook("btn visit wizard 2 not found", gd.lazy_screenshot())
                 return False
             
         gd.pause(self.slow)
@@ -1273,15 +1306,21 @@ class SlotFinder:
 
         return True
    
-    def _find_slots(self, user: UserConfig) -> bool:
+    def _find_slots(self, user: UserConfig) -> bool|None:
+        """
+        Проходит все пары (услуга, консульство) пользователя.
+        - True  — слот забронирован, остальные пары не проверяются
+        - False — свободных слотов не найдено
+        - None  — визард не удалось открыть (жёсткая ошибка)
+        """
         
         is_found = False
         
         if not self.open_visit_wizard():
-                    return False
+                    return None
 
         if self.is_servise_not_available():
-            return False
+            return None
                 
         self.fill_data_personal(user)
         
@@ -1329,25 +1368,52 @@ class SlotFinder:
                                     continue
                             
                                 if not result_wait:
-                                    _error_hook("error open page find slot", gd.take_screenshot())
+                                    _error_hook("error open page find slot", gd.lazy_screenshot())
                                     continue
                             
                             is_found = self.find_free_slot_months(user, cons, consular_service)
                             
+                            if is_found:
+                                return True
+                            
                             if is_found == None:
                                 LOGGER.debug("find_free_slot_months exit with error")
                                 continue
                             
                         else:
-                            _error_hook("open page find slots failed", gd.take_screenshot())
+                            _error_hook("open page find slots failed", gd.lazy_screenshot())
                             continue
                             
                     else:
-                        _error_hook("check consular service failed", gd.take_screenshot())
+                        _error_hook("check consular service failed", gd.lazy_screenshot())
                         continue
                 
                 else:
-                    _error_hook("check_consulates failed", gd.take_screenshot())
+                    _error_hook("check_consulates failed", gd.lazy_screenshot())
                     continue
       
-        return is_found
\ No newline at end of file
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Warm-up: тяжёлая инициализация при импорте, а не на первом скане слотов
+# ---------------------------------------------------------------------------
+def _warmup() -> None:
+    """Прогрев OCR-движка и локали babel в фоне."""
+    try:
+        if _TESS is not None:
+            with _TESS_LOCK:
+                _TESS.SetImage(Image.new("L", (32, 32), 255))
+                _TESS.GetUTF8Text()
+        else:
+            # первый запуск tesseract.exe: чтение ukr.traineddata с диска в кэш ОС
+            pytesseract.image_to_string(np.zeros((32, 32, 3), np.uint8), lang="ukr")
+        # первая загрузка локали uk в babel – несколько сотен мс
+        format_date(date.today(), format='d MMMM', locale='uk')
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning("warmup failed: %s", exc)
+
+
+# daemon-поток, а не SHARED_POOL: медленный прогрев не должен задерживать выход
+# интерпретатора у скриптов/тестов, которые лишь импортируют модуль
+threading.Thread(target=_warmup, name="slot-finder-warmup", daemon=True).start()
@@ -27,9 +27,14 @@ slot_obtained_hook(alias, date, time, screenshot)``
 """
 from __future__ import annotations
 
+import atexit
 import datetime as _dt
+import queue
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Protocol, Union
 
 from bot_io.html_logger import html_log
 from utils.logger import setup_logger
@@ -39,11 +44,99 @@ import traceback
 LOGGER = setup_logger(__name__)
 
 # ---------------------------------------------------------------------------
-# Helper: formatted timestamp
+# Async HTML log: запись на диск – в фоновом потоке, не в потоке бота
 # ---------------------------------------------------------------------------
+class PendingScreenshot(Protocol):
+    """Кадр уже снят (``gd.lazy_screenshot()``), ``save()`` кодирует PNG и пишет файл."""
+
+    def save(self) -> Path: ...
+
+
+# Скриншот для хука:
+# * Path – готовый файл;
+# * PendingScreenshot – кадр снят вызывающим, PNG кодирует фоновый поток;
+# * функция без аргументов (напр. ``gd.lazy_screenshot``) – снимает кадр; хук
+#   вызывает её сразу, в момент события, и только если запись не отброшена.
+Screenshot = Union[Path, PendingScreenshot, Callable[[], Union[Path, PendingScreenshot]]]
+
+
+def _capture(screenshot: Optional[Screenshot]) -> Optional[Union[Path, PendingScreenshot]]:
+    """Снять кадр сейчас, если передана функция съёмки; ошибка съёмки – не ошибка хука."""
+    if screenshot is None or isinstance(screenshot, Path) or hasattr(screenshot, "save"):
+        return screenshot  # type: ignore[return-value]
+    try:
+        return screenshot()
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning("Cannot take screenshot: %s", exc)
+        return None
+
+_LOG_Q: "queue.Queue[tuple[str, str, Optional[Path | PendingScreenshot]] | None]" = queue.Queue()
+
+
+def _drain() -> None:
+    stop = False
+    while not stop:
+        # блокируемся на первой записи, остальное, что уже накопилось, – забираем
+        # пачкой и пишем в HTML одним открытием файла
+        batch = [_LOG_Q.get()]
+        while True:
+            try:
+                batch.append(_LOG_Q.get_nowait())
+            except queue.Empty:
+                break
+
+        entries = []
+        for item in batch:
+            if item is None:  # sentinel от _flush
+                stop = True
+                break
+            msg, level, screenshot = item
+            try:
+                # кадр снят ещё в хуке – здесь только кодирование PNG и запись
+                if screenshot is not None and not isinstance(screenshot, Path):
+                    screenshot = screenshot.save()
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.warning("Cannot write screenshot: %s", exc)
+                screenshot = None
+            entries.append((msg, level, screenshot))
+
+        try:
+            html_log.add_many(entries)
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("Cannot write html log entry: %s", exc)
+
+
+_DRAIN_THREAD = threading.Thread(target=_drain, name="html-log", daemon=True)
+_DRAIN_THREAD.start()
+
+
+@atexit.register
+def _flush() -> None:
+    """Дописать оставшиеся записи перед выходом."""
+    _LOG_Q.put(None)
+    _DRAIN_THREAD.join(timeout=10)
 
-def _ts() -> str:
-    return _dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+# ---------------------------------------------------------------------------
+# Дедуплікація slot_found_hook: той самий слот не оголошується частіше ніж раз
+# на _SEEN_TTL секунд (без форматування, HTML-запису і копіювання скриншоту)
+# ---------------------------------------------------------------------------
+_SEEN_TTL = 30.0
+_SEEN_MAX = 1024
+_SEEN: "OrderedDict[tuple, float]" = OrderedDict()
+_SEEN_LOCK = threading.Lock()
+
+
+def _recently_seen(key: tuple) -> bool:
+    now = time.monotonic()
+    with _SEEN_LOCK:
+        last = _SEEN.get(key)
+        if last is not None and now - last < _SEEN_TTL:
+            return True
+        _SEEN[key] = now
+        _SEEN.move_to_end(key)
+        if len(_SEEN) > _SEEN_MAX:
+            _SEEN.popitem(last=False)
+    return False
 
 # ---------------------------------------------------------------------------
 # Hooks implementation
@@ -52,7 +145,7 @@ def _ts() -> str:
 def next_user_hook(alias: str) -> None:
     msg = f"▶ Перехід до користувача: <b>{alias}</b>"
     LOGGER.info(msg)
-    html_log.add(msg, level="info")
+    _LOG_Q.put((msg, "info", None))
 
 
 def slot_found_hook(
@@ -62,14 +155,16 @@ def slot_found_hook(
     service: str,
     dt: _dt.date,
     time_: str,
-    screenshot: Optional[Path] = None,
+    screenshot: Optional[Screenshot] = None,
 ) -> None:
+    if _recently_seen((country, consulate, service, dt, time_)):
+        return
     msg = (
         f"‎🕓 Знайдено слот – {country} / {consulate} / {service} – "
         f"<b>{dt} {time_}</b>"
     )
     LOGGER.info(msg)
-    html_log.add(msg, level="info", screenshot=screenshot)
+    _LOG_Q.put((msg, "info", _capture(screenshot)))
 
 
 def slot_obtained_hook(
@@ -79,14 +174,14 @@ def slot_obtained_hook(
     service: str,
     dt: _dt.date,
     time_: str,
-    screenshot: Optional[Path] = None
+    screenshot: Optional[Screenshot] = None
 ) -> None:
     msg = f"✅ Слот {country} - {consulate} - {service} - {dt} - {time_} заброньовано для <b>{alias}</b>"
     LOGGER.info(msg)
-    html_log.add(msg, level="success", screenshot=screenshot)
+    _LOG_Q.put((msg, "success", _capture(screenshot)))
 
 
-def error_hook(text: str, screenshot: Optional[Path] = None) -> None:
+def error_hook(text: str, screenshot: Optional[Screenshot] = None) -> None:
     # Получаем стек вызовов
     tb = traceback.extract_stack()[:-1]  # убираем текущий вызов hook'а
     last = tb[-1] if tb else None
@@ -95,4 +190,4 @@ def error_hook(text: str, screenshot: Optional[Path] = None) -> None:
     msg = f"❌ ПОМИЛКА – {text} (в файлі {location})"
 
     LOGGER.error(msg)
-    html_log.add(msg, level="error", screenshot=screenshot)
+    _LOG_Q.put((msg, "error", _capture(screenshot)))
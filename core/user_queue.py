@@ -0,0 +1,74 @@
+"""
+Очередь пользователей бота (alias → UserConfig) с ожиданием в pop_left().
+
+Без зависимостей от GUI – импортируется и тестируется без дисплея.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from bot_io.yaml_loader import UserConfig
+from server.tcp_server import STOP_EVT
+
+class UserQueue:
+    """
+    Очередь пользователей в порядке обработки. Хранится как
+    OrderedDict[alias → UserConfig]: добавление, замена и удаление по alias – O(1).
+    """
+
+    def __init__(self, initial: list[UserConfig]):
+        self._od: OrderedDict[str, UserConfig] = OrderedDict((u.alias, u) for u in initial)
+        # RLock: update() вызывает append() под тем же замком;
+        # Condition будит pop_left(), как только в очереди появился пользователь
+        self._lock = threading.Condition(threading.RLock())
+
+    def pop_left(self, timeout: Optional[float] = None) -> Optional[UserConfig]:
+        """
+        Забрать первого пользователя. Если очередь пуста – ждать до `timeout`
+        секунд (None – без ожидания) появления пользователя или STOP_EVT.
+        """
+        with self._lock:
+            if timeout is not None:
+                self._lock.wait_for(lambda: self._od or STOP_EVT.is_set(), timeout)
+            if not self._od:
+                return None
+            _, user = self._od.popitem(last=False)
+            return user
+
+    def append(self, user: UserConfig) -> None:
+        with self._lock:
+            self._od[user.alias] = user
+            self._od.move_to_end(user.alias)
+            self._lock.notify()
+
+    def remove(self, alias: str) -> None:
+        with self._lock:
+            self._od.pop(alias, None)
+
+    def update(self, user: UserConfig) -> None:
+        with self._lock:
+            if user.alias in self._od:
+                self._od[user.alias] = user  # позиция в очереди сохраняется
+            else:
+                self.append(user)
+
+    def prioritize(self, pred: Callable[[UserConfig], bool]) -> None:
+        """
+        Перенести в начало очереди пользователей, для которых `pred` истинно,
+        сохраняя их взаимный порядок. Один проход; `pred` – один раз на пользователя.
+        """
+        with self._lock:
+            priority = [alias for alias, u in self._od.items() if pred(u)]
+            for alias in reversed(priority):
+                self._od.move_to_end(alias, last=False)
+
+    def exists(self, alias: str) -> bool:
+        return alias in self._od
+
+    def __len__(self) -> int:
+        return len(self._od)
+
+    def __bool__(self) -> bool:
+        return bool(self._od)
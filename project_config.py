@@ -4,7 +4,7 @@ from __future__ import annotations
 import sys
 import yaml
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 def resource_path(filename: str) -> Path:
     """
@@ -23,52 +23,104 @@ def resource_path(filename: str) -> Path:
 _SETTINGS_PATH = resource_path("settings.yaml")
 
 # -------------------------------------------------------------------
-# 2) Загружаем YAML-данные при импорте (одно чтение)
+# 2) YAML читается лениво – при первом обращении к любой константе
 # -------------------------------------------------------------------
+# libyaml (CSafeLoader) в разы быстрее чистого Python; если PyYAML собран без него – SafeLoader
 try:
-    with _SETTINGS_PATH.open("rt", encoding="utf-8") as _fh:
-        _RAW_SETTINGS: Dict[str, Any] = yaml.safe_load(_fh) or {}
-except FileNotFoundError:
-    raise RuntimeError(f"settings.yaml not found at {_SETTINGS_PATH}")
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+
+_RAW_SETTINGS: Optional[Dict[str, Any]] = None
+
+def _raw() -> Dict[str, Any]:
+    """Содержимое settings.yaml (одно чтение на процесс)."""
+    global _RAW_SETTINGS
+    if _RAW_SETTINGS is None:
+        try:
+            with _SETTINGS_PATH.open("rt", encoding="utf-8") as _fh:
+                _RAW_SETTINGS = yaml.load(_fh, Loader=_Loader) or {}
+        except FileNotFoundError:
+            raise RuntimeError(f"settings.yaml not found at {_SETTINGS_PATH}")
+    return _RAW_SETTINGS
+
+def _p(key: str, default: str) -> Callable[[Dict[str, Any]], Path]:
+    """Резолвер пути из settings.yaml → абсолютный Path (с раскрытием ~)."""
+    return lambda r: Path(r.get(key, default)).expanduser().resolve()
+
+def _v(key: str, default: Any, cast: Callable[[Any], Any]) -> Callable[[Dict[str, Any]], Any]:
+    return lambda r: cast(r.get(key, default))
 
 # -------------------------------------------------------------------
-# 3) “Высвобождаем” из _RAW_SETTINGS нужные переменные в виде констант
+# 3) Константы: имя → резолвер. Значение вычисляется в __getattr__
+#    (PEP 562) и кладётся в globals(), дальше – обычный доступ к модулю.
 # -------------------------------------------------------------------
-# Пример: пути к каталогам
-USERS_DIR: Path = Path(_RAW_SETTINGS.get("users_dir", "users_cfg")).expanduser().resolve()
-KEYS_DIR:  Path = Path(_RAW_SETTINGS.get("keys_dir", "keys")).expanduser().resolve()
+_RESOLVERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    # Пути к каталогам
+    "USERS_DIR": _p("users_dir", "users_cfg"),
+    "KEYS_DIR":  _p("keys_dir", "keys"),
+
+    # Путь до шаблона профиля Chrome
+    "CHROME_TEMPLATE":  _p("chrome_template", "chrome_template/profile"),
+    "CHROME_TEMPLATES": _p("chrome_templates", "chrome_template/profiles"),
+
+    # Флаг: сохраняем ли профили между запусками
+    "KEEP_PROFILES": _v("keep_profiles", False, bool),
+
+    # Порт TCP-контроля (pause/resume/stop)
+    "CONTROL_PORT": _v("control_port", 4567, int),
 
-# Путь до шаблона профиля Chrome
-CHROME_TEMPLATE: Path = Path(_RAW_SETTINGS.get("chrome_template", "chrome_template/profile")) \
-                            .expanduser().resolve()
-CHROME_TEMPLATES: Path = Path(_RAW_SETTINGS.get("chrome_templates", "chrome_template/profiles")) \
-                            .expanduser().resolve()
+    # Параметры для целевого монитора
+    "MONITOR_WIDTH":  _v("monitor_width", 1920, int),
+    "MONITOR_HEIGHT": _v("monitor_height", 1080, int),
+    "MONITOR_INDEX":  _v("monitor_index", 1, int),
 
-# Флаг: сохраняем ли профили между запусками
-KEEP_PROFILES: bool = bool(_RAW_SETTINGS.get("keep_profiles", False))
+    "TEMPLATE_DIR": _p("ui_images", ""),
 
-# Порт TCP-контроля (pause/resume/stop)
-CONTROL_PORT: int = int(_RAW_SETTINGS.get("control_port", 4567))
+    # Настройки HTML-логгера
+    "HTML_LOG_DIR": _p("html_log_dir", "data/html_log"),
 
-# Параметры для целевого монитора
-MONITOR_WIDTH:  int = int(_RAW_SETTINGS.get("monitor_width", 1920))
-MONITOR_HEIGHT: int = int(_RAW_SETTINGS.get("monitor_height", 1080))
-MONITOR_INDEX: int = int(_RAW_SETTINGS.get("monitor_index", 1))
+    # Уровень логирования (строка, например "DEBUG", "INFO")
+    "LOG_LEVEL": lambda r: str(r.get("log_level", "INFO")).upper(),
 
-TEMPLATE_DIR: Path = Path(_RAW_SETTINGS.get("ui_images", "")).expanduser().resolve()
+    "TESSDATA_PREFIX": _v("tessdata_prefix", r"C:/Program Files/Tesseract-OCR/tessdata", str),
+    "TESSERCAT_CMD":   _v("tesseract_cmd", r"C:/Program Files/Tesseract-OCR/tesseract.exe", str),
 
-# Настройки HTML-логгера
-HTML_LOG_DIR: Path = Path(_RAW_SETTINGS.get("html_log_dir", "data/html_log")).expanduser().resolve()
+    "CHECK_EMPTY_TEMPLATE_PATH":   _v("check_empty_template_path", "check_empty.png", str),
+    "CHECK_CHECKED_TEMPLATE_PATH": _v("check_checked_template_path", "check_checked.png", str),
 
-# Уровень логирования (строка, например "DEBUG", "INFO")
-LOG_LEVEL: str = str(_RAW_SETTINGS.get("log_level", "INFO")).upper()
+    "VISIT_CHECK_DAY_TEMPLATE_PATH":   _v("visit_check_day_template_path", "visit_check_day.png", str),
+    "VISIT_CHECK_WEEK_TEMPLATE_PATH":  _v("visit_check_week_template_path", "visit_check_week.png", str),
+    "VISIT_CHECK_MONTH_TEMPLATE_PATH": _v("visit_check_month_template_path", "visit_check_month.png", str),
+}
 
-TESSDATA_PREFIX: str = str(_RAW_SETTINGS.get("tessdata_prefix", r"C:/Program Files/Tesseract-OCR/tessdata"))
-TESSERCAT_CMD: str = str(_RAW_SETTINGS.get("tesseract_cmd", r"C:/Program Files/Tesseract-OCR/tesseract.exe"))
+# Аннотации без значений – только для IDE/type-checker, в globals() их нет
+USERS_DIR: Path
+KEYS_DIR: Path
+CHROME_TEMPLATE: Path
+CHROME_TEMPLATES: Path
+KEEP_PROFILES: bool
+CONTROL_PORT: int
+MONITOR_WIDTH: int
+MONITOR_HEIGHT: int
+MONITOR_INDEX: int
+TEMPLATE_DIR: Path
+HTML_LOG_DIR: Path
+LOG_LEVEL: str
+TESSDATA_PREFIX: str
+TESSERCAT_CMD: str
+CHECK_EMPTY_TEMPLATE_PATH: str
+CHECK_CHECKED_TEMPLATE_PATH: str
+VISIT_CHECK_DAY_TEMPLATE_PATH: str
+VISIT_CHECK_WEEK_TEMPLATE_PATH: str
+VISIT_CHECK_MONTH_TEMPLATE_PATH: str
 
-CHECK_EMPTY_TEMPLATE_PATH: str = str(_RAW_SETTINGS.get("check_empty_template_path", "check_empty.png"))
-CHECK_CHECKED_TEMPLATE_PATH: str = str(_RAW_SETTINGS.get("check_checked_template_path", "check_checked.png"))
+def __getattr__(name: str) -> Any:
+    resolver = _RESOLVERS.get(name)
+    if resolver is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = resolver(_raw())
+    return value
 
-VISIT_CHECK_DAY_TEMPLATE_PATH: str = str(_RAW_SETTINGS.get("visit_check_day_template_path", "visit_check_day.png"))
-VISIT_CHECK_WEEK_TEMPLATE_PATH: str = str(_RAW_SETTINGS.get("visit_check_week_template_path", "visit_check_week.png"))
-VISIT_CHECK_MONTH_TEMPLATE_PATH: str = str(_RAW_SETTINGS.get("visit_check_month_template_path", "visit_check_month.png"))
\ No newline at end of file
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_RESOLVERS))
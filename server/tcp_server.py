@@ -6,18 +6,24 @@ commands recognised by the bot runtime:
 
 * `pause`: set global flag PAUSE  (main loop sleeps until resume)
 * `resume`: clear PAUSE
-* `stop`: set global flag STOP   (main loop exits gracefully)
+* `stop`: set global flag STOP   (main loop exits gracefully, hard exit after
+  STOP_GRACE_SEC)
 
-The server runs in its own daemon thread and only updates thread-safe Events,
-which the manager polls.
+All sockets are nonblocking and multiplexed by `selectors` inside the single
+ControlServer daemon thread (no thread per client). The server only updates
+thread-safe Events, which the manager polls.
 """
 
 from __future__ import annotations
+import logging
+import os
+import selectors
+import socket
+import sys
 import threading
-import socketserver
-from typing import Final
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Final, Tuple
 from utils.logger import setup_logger
-import os
 
 LOGGER = setup_logger(__name__)
 
@@ -27,54 +33,121 @@ LOGGER = setup_logger(__name__)
 STOP_EVT: Final[threading.Event] = threading.Event()
 PAUSE_EVT: Final[threading.Event] = threading.Event()
 
+# Смена состояния (pause/resume/stop) – под этим Condition с notify_all, чтобы
+# ожидающие просыпались сразу, а не по таймеру. RLock – stop может прийти из
+# обработчика сигнала в потоке, который сам сейчас внутри wait_for.
+CONTROL_CV: Final[threading.Condition] = threading.Condition(threading.RLock())
+
+
+def wait_for_resume(timeout: float | None = None) -> bool:
+    """Block while paused; True – пауза снята или запрошена остановка."""
+    with CONTROL_CV:
+        return CONTROL_CV.wait_for(
+            lambda: not PAUSE_EVT.is_set() or STOP_EVT.is_set(), timeout
+        )
+
+
+def request_stop() -> None:
+    """Set STOP_EVT and wake everyone blocked in ``wait_for_resume``."""
+    with CONTROL_CV:
+        STOP_EVT.set()
+        CONTROL_CV.notify_all()
+
 
 # ---------------------------------------------------------------------------
-# TCP request handler
+# Commands: bytes → (действие, готовый ответ в bytes)
 # ---------------------------------------------------------------------------
-class _Handler(socketserver.StreamRequestHandler):
-    """Handles a single TCP client connection and processes newline-terminated commands."""
+def _do_pause() -> None:
+    with CONTROL_CV:
+        PAUSE_EVT.set()
+        CONTROL_CV.notify_all()
 
-    def handle(self) -> None:
-        addr = f"{self.client_address[0]}:{self.client_address[1]}"
-        LOGGER.info("Client connected: %s", addr)
-        try:
-            for line in self.rfile:  # type: ignore[assignment]
-                cmd = line.decode(errors="ignore").strip().lower()
-                if not cmd:
-                    continue
-                LOGGER.debug("Command '%s' from %s", cmd, addr)
 
-                if cmd == "pause":
-                    PAUSE_EVT.set()
-                    self._reply("PAUSED")
+def _do_resume() -> None:
+    with CONTROL_CV:
+        PAUSE_EVT.clear()
+        CONTROL_CV.notify_all()
 
-                elif cmd == "resume":
-                    PAUSE_EVT.clear()
-                    self._reply("RESUMED")
 
-                elif cmd == "stop":
-                    STOP_EVT.set()
-                    self._reply("STOPPING")
-                    threading.Thread(target=lambda: os._exit(0), daemon=True).start()
+# Сколько секунд главный цикл может доделывать текущего пользователя после
+# `stop`, прежде чем процесс будет завершён принудительно (как раньше os._exit).
+STOP_GRACE_SEC: Final[float] = 30.0
 
-                else:
-                    self._reply("UNKNOWN")
 
-        except ConnectionResetError:
-            pass
-        finally:
-            LOGGER.info("Client disconnected: %s", addr)
+def _hard_exit() -> None:
+    LOGGER.warning("Main loop did not stop within %.0f s – forcing exit", STOP_GRACE_SEC)
+    os._exit(0)
+
+
+def _do_stop() -> None:
+    request_stop()
+    # finder.work() может идти минутами – если цикл не вышел сам, жёсткий выход.
+    # daemon-таймер не держит процесс, если штатное завершение успело раньше.
+    timer = threading.Timer(STOP_GRACE_SEC, _hard_exit)
+    timer.daemon = True
+    timer.start()
+
 
-    def _reply(self, text: str) -> None:
-        self.wfile.write((text + "\n").encode())  # type: ignore[arg-type]
-        self.wfile.flush()  # type: ignore[call-arg]
+_DISPATCH: Final[Dict[bytes, Tuple[Callable[[], None], bytes]]] = {
+    b"pause": (_do_pause, b"PAUSED\n"),
+    b"resume": (_do_resume, b"RESUMED\n"),
+    # главный цикл и ControlServer.run() завершатся сами по STOP_EVT,
+    # не позже чем через STOP_GRACE_SEC
+    b"stop": (_do_stop, b"STOPPING\n"),
+}
+_UNKNOWN: Final[bytes] = b"UNKNOWN\n"
 
 
 # ---------------------------------------------------------------------------
-# ThreadingTCPServer subclass allows address reuse
+# Client connection state
 # ---------------------------------------------------------------------------
-class _ThreadedTCPServer(socketserver.ThreadingTCPServer):
-    allow_reuse_address = True
+_RECV_SIZE: Final[int] = 4096
+_MAX_LINE: Final[int] = 1024      # строка длиннее – клиент отключается
+
+
+def _env_bytes(name: str) -> int:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return 0
+    try:
+        return int(raw)
+    except ValueError:
+        LOGGER.warning("Ignoring invalid %s=%r", name, raw)
+        return 0
+
+
+# SO_RCVBUF/SO_SNDBUF сами по себе не задаём – ядро автотюнит буферы лучше
+# фиксированных значений. Переменные окружения позволяют лишь *увеличить* их.
+_RCVBUF: Final[int] = _env_bytes("CONTROL_RCVBUF")
+_SNDBUF: Final[int] = _env_bytes("CONTROL_SNDBUF")
+
+
+def _raise_buffers(sock: socket.socket) -> None:
+    for opt, wanted in ((socket.SO_RCVBUF, _RCVBUF), (socket.SO_SNDBUF, _SNDBUF)):
+        if wanted and wanted > sock.getsockopt(socket.SOL_SOCKET, opt):
+            sock.setsockopt(socket.SOL_SOCKET, opt, wanted)
+
+
+@dataclass(eq=False)
+class _Client:
+    """Buffers of a single nonblocking client connection."""
+    sock: socket.socket
+    addr: str
+    inbuf: bytearray = field(default_factory=bytearray)
+    outbuf: bytearray = field(default_factory=bytearray)
+
+
+# ---------------------------------------------------------------------------
+# Selector backend
+# ---------------------------------------------------------------------------
+SelectorFactory = Callable[[], selectors.BaseSelector]
+
+
+def default_selector() -> selectors.BaseSelector:
+    """epoll на Linux, иначе – лучший доступный (select на Windows)."""
+    if sys.platform.startswith("linux") and hasattr(selectors, "EpollSelector"):
+        return selectors.EpollSelector()
+    return selectors.DefaultSelector()
 
 
 # ---------------------------------------------------------------------------
@@ -83,21 +156,168 @@ class _ThreadedTCPServer(socketserver.ThreadingTCPServer):
 class ControlServer(threading.Thread):
     daemon = True
 
-    def __init__(self, host: str = "0.0.0.0", port: int = 4567):
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 4567,
+        selector_factory: SelectorFactory = default_selector,
+    ):
         super().__init__(name="ControlServer")
-        self._srv = _ThreadedTCPServer((host, port), _Handler)
+        self._closing = threading.Event()
+        # другой backend (напр. io_uring) подключается через selector_factory
+        self._sel = selector_factory()
+
+        self._lsock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # только SO_REUSEADDR: второй экземпляр бота на занятом порту должен
+        # падать с ошибкой, а не делить команды с первым (как при SO_REUSEPORT)
+        self._lsock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # наследуется принятыми сокетами на большинстве ОС; в _accept – явно
+        self._lsock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        _raise_buffers(self._lsock)
+        self._lsock.bind((host, port))
+        self._lsock.listen()
+        self._lsock.setblocking(False)
+        self._sel.register(self._lsock, selectors.EVENT_READ, None)
+
+    @property
+    def server_address(self) -> Tuple[str, int]:
+        return self._lsock.getsockname()[:2]
 
     def run(self) -> None:  # pragma: no cover
-        LOGGER.info("TCP control server listening on %s:%d", *self._srv.server_address)
-        # serve_forever проверяет флаг shutdown каждые 0.5 сек
-        self._srv.serve_forever(poll_interval=0.5)
+        LOGGER.info("TCP control server listening on %s:%d", *self.server_address)
+        try:
+            # select с таймаутом 0.5 сек – shutdown()/STOP_EVT (в т.ч. от сигнала)
+            # отрабатывают не дольше этого
+            while not (self._closing.is_set() or STOP_EVT.is_set()):
+                for key, mask in self._sel.select(timeout=0.5):
+                    if key.data is None:
+                        self._accept()
+                        continue
+                    client: _Client = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._read(client)
+                    if mask & selectors.EVENT_WRITE and client.sock.fileno() != -1:
+                        self._flush(client)
+        finally:
+            self._close_all()
 
     def shutdown(self) -> None:
         """Stop the control server and wait for thread to finish."""
         LOGGER.info("Shutting down TCP control server …")
-        # прерываем serve_forever
-        self._srv.shutdown()
-        # закрываем слушающий сокет
-        self._srv.server_close()
-        # ждём завершения run()
-        self.join()
+        self._closing.set()
+        # ждём завершения run() – он сам закрывает сокеты
+        if self.is_alive():
+            self.join()
+        else:
+            self._close_all()
+
+    # ------------------------------------------------------------------
+    # IO
+    # ------------------------------------------------------------------
+    def _accept(self) -> None:
+        try:
+            sock, (host, port) = self._lsock.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        # ответы по несколько байт – без Nagle они уходят сразу
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        _raise_buffers(sock)
+        client = _Client(sock, f"{host}:{port}")
+        self._sel.register(sock, selectors.EVENT_READ, client)
+        LOGGER.info("Client connected: %s", client.addr)
+
+    def _read(self, client: _Client) -> None:
+        try:
+            data = client.sock.recv(_RECV_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:  # ConnectionResetError и т.п.
+            data = b""
+        if not data:
+            self._drop(client)
+            return
+
+        client.inbuf += data
+        while True:
+            nl = client.inbuf.find(b"\n")
+            if nl < 0:
+                break
+            line = bytes(client.inbuf[:nl])
+            del client.inbuf[:nl + 1]
+            self._handle_line(client, line)
+            # после stop остальные команды из буфера не исполняем
+            if STOP_EVT.is_set():
+                break
+
+        if len(client.inbuf) > _MAX_LINE:
+            LOGGER.warning("Line too long from %s – disconnecting", client.addr)
+            self._drop(client)
+            return
+
+        self._flush(client)
+
+    def _handle_line(self, client: _Client, line: bytes) -> None:
+        # сравниваем bytes напрямую – без decode() на каждую строку
+        cmd = line.strip().lower()
+        if not cmd:
+            return
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Command %r from %s", cmd, client.addr)
+
+        entry = _DISPATCH.get(cmd)
+        if entry is None:
+            self._reply(client, _UNKNOWN)
+            return
+        action, reply = entry
+        action()
+        self._reply(client, reply)
+
+    def _reply(self, client: _Client, reply: bytes) -> None:
+        client.outbuf += reply
+
+    def _flush(self, client: _Client) -> None:
+        if client.outbuf:
+            try:
+                sent = client.sock.send(client.outbuf)
+                del client.outbuf[:sent]
+            except BlockingIOError:
+                pass
+            except OSError:
+                self._drop(client)
+                return
+
+        # ждём EVENT_WRITE только пока есть неотправленный хвост
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outbuf else 0)
+        if self._sel.get_key(client.sock).events != events:
+            self._sel.modify(client.sock, events, client)
+
+    def _drop(self, client: _Client) -> None:
+        try:
+            self._sel.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+        LOGGER.info("Client disconnected: %s", client.addr)
+
+    def _close_all(self) -> None:
+        if self._lsock.fileno() == -1:
+            return
+        for key in list(self._sel.get_map().values()):
+            if key.data is None:
+                continue
+            client: _Client = key.data
+            if client.outbuf:
+                try:
+                    client.sock.setblocking(True)
+                    client.sock.settimeout(1.0)
+                    client.sock.sendall(client.outbuf)
+                except OSError:
+                    pass
+            self._drop(client)
+        try:
+            self._sel.unregister(self._lsock)
+        except (KeyError, ValueError):
+            pass
+        self._lsock.close()
+        self._sel.close()
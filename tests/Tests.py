@@ -11,10 +11,15 @@ mocked so CI can execute without a display.
 from __future__ import annotations
 
 import os
+import socket
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from textwrap import dedent
+from types import SimpleNamespace
+from unittest import mock
 
 from cryptography.fernet import Fernet
 
@@ -28,8 +33,11 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from bot_io.yaml_loader import YAMLLoader, ConfigError
 from bot_io.config_watcher import ConfigWatcher, ChangeKind
-from utils.crypto_utils import encrypt, decrypt, generate_key
+from utils.crypto_utils import encrypt, decrypt, encrypt_many, decrypt_many, generate_key
 from utils.profile_manager import prepare as prepare_profile
+from core.date_slots import parse_date_slots
+from core.user_queue import UserQueue
+from server import tcp_server
 
 
 class CryptoUtilTests(unittest.TestCase):
@@ -44,6 +52,23 @@ class CryptoUtilTests(unittest.TestCase):
         token = encrypt("secret123")
         self.assertEqual(decrypt(token), "secret123")
 
+    def test_encrypt_decrypt_many(self):
+        plain = ["a", "secret123", ""]
+        tokens = encrypt_many(plain)
+        self.assertEqual(decrypt_many(tokens), plain)
+        self.assertEqual(decrypt(tokens[1]), "secret123")
+
+    def test_fast_decrypt_matches_fernet(self):
+        token = encrypt("secret123")
+        os.environ["CRYPTO_FAST"] = "1"
+        try:
+            self.assertEqual(decrypt(token), "secret123")
+            tampered = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+            with self.assertRaises(ValueError):
+                decrypt(tampered)
+        finally:
+            os.environ.pop("CRYPTO_FAST", None)
+
 
 class YAMLLoaderTests(unittest.TestCase):
     def setUp(self):
@@ -140,6 +165,121 @@ class ProfileManagerTests(unittest.TestCase):
         # after context – directory removed
         self.assertFalse(prof.exists())
 
+    def test_prepare_many_cleanup(self):
+        from utils.profile_manager import prepare_many
+
+        with prepare_many(["user_a", "user_b"]) as profs:
+            self.assertEqual(len(profs), 2)
+            for prof in profs:
+                self.assertTrue((prof / "First Run").exists())
+        for prof in profs:
+            self.assertFalse(prof.exists())
+
+
+class ParseDateSlotsTests(unittest.TestCase):
+    def test_low_confidence_separator_kept(self):
+        tokens = ["02.06.2025", "-", "08.06.2025", "слотів:", "5", "шум"]
+        confs = [95, 12, 93, 88, 90, 20]
+        self.assertEqual(
+            parse_date_slots(tokens, confs),
+            [("02.06.2025", "08.06.2025", 5)],
+        )
+
+    def test_low_confidence_tokens_dropped(self):
+        tokens = ["02.06.2025", "-", "08.06.2025", "7", "слотів", "3"]
+        confs = [95, 90, 93, 15, 88, 91]
+        self.assertEqual(
+            parse_date_slots(tokens, confs),
+            [("02.06.2025", "08.06.2025", 3)],
+        )
+
+    def test_date_token_normalized(self):
+        tokens = ["0.06.2025", "-", "0Z.07.2025", "12"]
+        self.assertEqual(
+            parse_date_slots(tokens),
+            [("30.06.2025", "03.07.2025", 12)],
+        )
+
+
+class UserQueueTests(unittest.TestCase):
+    @staticmethod
+    def _user(alias: str, **kw):
+        # UserQueue смотрит только на alias – полный UserConfig не нужен
+        return SimpleNamespace(alias=alias, **kw)
+
+    def _aliases(self, queue: UserQueue) -> list:
+        out = []
+        while queue:
+            out.append(queue.pop_left().alias)
+        return out
+
+    def test_prioritize_keeps_relative_order(self):
+        queue = UserQueue([self._user(a) for a in "abcde"])
+        queue.prioritize(lambda u: u.alias in ("b", "d"))
+        self.assertEqual(self._aliases(queue), ["b", "d", "a", "c", "e"])
+
+    def test_update_keeps_position(self):
+        queue = UserQueue([self._user("a"), self._user("b"), self._user("c")])
+        queue.update(self._user("b", tag="new"))
+        queue.update(self._user("d"))  # новый – в конец
+        self.assertEqual(len(queue), 4)
+        queue.pop_left()
+        updated = queue.pop_left()
+        self.assertEqual((updated.alias, updated.tag), ("b", "new"))
+        self.assertEqual(self._aliases(queue), ["c", "d"])
+
+    def test_pop_left_wakes_on_append(self):
+        queue = UserQueue([])
+        timer = threading.Timer(0.1, queue.append, args=(self._user("late"),))
+        timer.start()
+        started = time.monotonic()
+        user = queue.pop_left(timeout=5)
+        timer.join()
+        self.assertEqual(user.alias, "late")
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_pop_left_timeout_returns_none(self):
+        queue = UserQueue([])
+        started = time.monotonic()
+        self.assertIsNone(queue.pop_left(timeout=0.2))
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+        self.assertIsNone(queue.pop_left())
+
+
+class ControlServerTests(unittest.TestCase):
+    def setUp(self):
+        self.srv = tcp_server.ControlServer(host="127.0.0.1", port=0)
+        self.srv.start()
+        self.conn = socket.create_connection(self.srv.server_address, timeout=5)
+        self.reader = self.conn.makefile("rb")
+
+    def tearDown(self):
+        self.reader.close()
+        self.conn.close()
+        self.srv.shutdown()
+        tcp_server.STOP_EVT.clear()
+        tcp_server.PAUSE_EVT.clear()
+
+    def _send(self, cmd: bytes) -> bytes:
+        self.conn.sendall(cmd + b"\n")
+        return self.reader.readline()
+
+    def test_commands_over_loopback(self):
+        self.assertEqual(self._send(b"pause"), b"PAUSED\n")
+        self.assertTrue(tcp_server.PAUSE_EVT.is_set())
+
+        self.assertEqual(self._send(b"RESUME"), b"RESUMED\n")
+        self.assertFalse(tcp_server.PAUSE_EVT.is_set())
+
+        self.assertEqual(self._send(b"dance"), b"UNKNOWN\n")
+
+        # жёсткий выход по таймеру в тестовом процессе не нужен
+        with mock.patch.object(tcp_server, "_hard_exit"):
+            self.assertEqual(self._send(b"stop"), b"STOPPING\n")
+        self.assertTrue(tcp_server.STOP_EVT.is_set())
+        self.srv.join(timeout=5)
+        self.assertFalse(self.srv.is_alive())
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
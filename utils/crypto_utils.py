@@ -9,6 +9,8 @@ Environment variable
 --------------------
 FERNET_SECRET_KEY   – 32-byte URL-safe base64 string generated once and kept
                       on the machine (or in CI secret storage).
+CRYPTO_FAST         – "1" → decrypt via HMAC + AES-CBC primitives directly
+                      instead of the Fernet wrapper (same token format).
 
 CLI usage (examples)
 --------------------
@@ -18,12 +20,19 @@ $ python -m utils.crypto_utils --decrypt "<token>"    # -> clear-text
 """
 from __future__ import annotations
 
+import base64
+import binascii
+import hashlib
+import hmac
 import os
 import sys
 from argparse import ArgumentParser
-from typing import Final
+from functools import lru_cache
+from typing import Final, Iterable
 
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 FERNET_ENV: Final[str] = "FERNET_SECRET_KEY"
 
@@ -42,6 +51,75 @@ def _get_key() -> bytes:
     return key.encode()
 
 
+@lru_cache(maxsize=4)
+def _fernet(key: bytes) -> Fernet:
+    """Fernet per key: base64-decode and key split happen once, not per call.
+
+    The cache is keyed by the key itself, so a changed FERNET_SECRET_KEY simply
+    yields a new instance on the next call.
+    """
+    return Fernet(key)
+
+
+# --------------------------------------------------------------------------- #
+# Fast path (CRYPTO_FAST=1): HMAC + AES-CBC напрямую, без обёртки Fernet
+# --------------------------------------------------------------------------- #
+FAST_ENV: Final[str] = "CRYPTO_FAST"
+
+_VERSION: Final[int] = 0x80
+_HMAC_LEN: Final[int] = 32
+
+
+def _fast_enabled() -> bool:
+    return os.getenv(FAST_ENV) == "1"
+
+
+@lru_cache(maxsize=4)
+def _split_key(key: bytes) -> tuple[bytes, bytes]:
+    """Fernet key → (signing_key, encryption_key)."""
+    raw = base64.urlsafe_b64decode(key)
+    if len(raw) != 32:
+        raise ValueError("Fernet key must be 32 url-safe base64-encoded bytes")
+    return raw[:16], raw[16:]
+
+
+def _fast_decrypt(token: bytes, key: bytes) -> bytes:
+    """Decrypt a Fernet token: version | ts(8) | IV(16) | ciphertext | HMAC(32).
+
+    HMAC проверяется так же, как в Fernet; TTL и допуск часов не проверяются
+    (``decrypt`` вызывается без ttl, токены – из локальных конфигов).
+    """
+    signing_key, encryption_key = _split_key(key)
+    try:
+        data = base64.urlsafe_b64decode(token)
+    except (TypeError, binascii.Error) as exc:
+        raise InvalidToken from exc
+    if len(data) < 1 + 8 + 16 + 16 + _HMAC_LEN or data[0] != _VERSION:
+        raise InvalidToken
+
+    body, mac = data[:-_HMAC_LEN], data[-_HMAC_LEN:]
+    expected = hmac.new(signing_key, body, hashlib.sha256).digest()
+    if not hmac.compare_digest(mac, expected):
+        raise InvalidToken
+
+    iv, ciphertext = body[9:25], body[25:]
+    if len(ciphertext) % 16:
+        raise InvalidToken
+    decryptor = Cipher(algorithms.AES(encryption_key), modes.CBC(iv)).decryptor()
+    padded = decryptor.update(ciphertext) + decryptor.finalize()
+    unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+    try:
+        return unpadder.update(padded) + unpadder.finalize()
+    except ValueError as exc:
+        raise InvalidToken from exc
+
+
+def _decrypt_bytes(token: str, key: bytes) -> bytes:
+    if _fast_enabled():
+        return _fast_decrypt(token.encode(), key)
+    return _fernet(key).decrypt(token.encode())
+
+
 def generate_key() -> str:
     """Return fresh Fernet key (URL-safe base64)."""
     return Fernet.generate_key().decode()
@@ -49,15 +127,28 @@ def generate_key() -> str:
 
 def encrypt(plaintext: str) -> str:
     """Encrypt *plaintext* using key from env → Fernet token."""
-    f = Fernet(_get_key())
-    return f.encrypt(plaintext.encode()).decode()
+    return _fernet(_get_key()).encrypt(plaintext.encode()).decode()
 
 
 def decrypt(token: str) -> str:
     """Decrypt Fernet *token* → clear-text."""
-    f = Fernet(_get_key())
     try:
-        return f.decrypt(token.encode()).decode()
+        return _decrypt_bytes(token, _get_key()).decode()
+    except InvalidToken as exc:
+        raise ValueError("Invalid Fernet token or wrong key") from exc
+
+
+def encrypt_many(plaintexts: Iterable[str]) -> list[str]:
+    """Encrypt several strings with one Fernet instance."""
+    f = _fernet(_get_key())
+    return [f.encrypt(p.encode()).decode() for p in plaintexts]
+
+
+def decrypt_many(tokens: Iterable[str]) -> list[str]:
+    """Decrypt several Fernet tokens with one cached key/Fernet instance."""
+    key = _get_key()
+    try:
+        return [_decrypt_bytes(t, key).decode() for t in tokens]
     except InvalidToken as exc:
         raise ValueError("Invalid Fernet token or wrong key") from exc
 
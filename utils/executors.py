@@ -0,0 +1,26 @@
+"""executors.py
+~~~~~~~~~~~~~~~~
+
+Один общий ``ThreadPoolExecutor`` на процесс для коротких фоновых задач
+(разбор YAML, параллельные OCR-пробы, прогрев) – вместо отдельных потоков и
+пулов, создаваемых на каждый вызов.
+
+Usage
+-----
+```python
+from utils.executors import SHARED_POOL
+future = SHARED_POOL.submit(fn, *args)
+```
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final
+
+__all__ = ["SHARED_POOL"]
+
+SHARED_POOL: Final[ThreadPoolExecutor] = ThreadPoolExecutor(
+    max_workers=min(os.cpu_count() or 1, 8),
+    thread_name_prefix="consul",
+)
@@ -2,13 +2,15 @@
 ~~~~~~~~~~~~
 
 Project‑wide helper that configures **console + rotating file** logging based on
-environment variables.  Код предоставлен пользователем; добавлены минимальные
+environment variables.  Логгеры пишут в очередь (``QueueHandler``), а вывод в
+консоль и файл выполняет один фоновый ``QueueListener``.  Код предоставлен пользователем; добавлены минимальные
 doc‑string и type‑hints.
 
 Environment variables
 ---------------------
 * ``LOG_LEVEL`` – DEBUG / INFO / WARNING / ERROR (default INFO)
 * ``LOG_FILE``  – path to log‑file; may be relative (to project root) or absolute
+* ``LOG_MMAP``  – ``1`` → писать файл через mmap (``MmapFileHandler``, без ротации)
 
 Usage
 -----
@@ -17,19 +19,31 @@ from utils.logger import setup_logger
 LOGGER = setup_logger(__name__)
 ```
 
-Calling ``setup_logger(__name__)`` many times is safe – существующие хендлеры
-очищаются, повторной конфигурации не будет.
+Calling ``setup_logger(__name__)`` many times is safe – хендлеры создаются один
+раз на root-логгере, модульные логгеры лишь выставляют уровень и передают записи
+вверх (propagate).
 """
 from __future__ import annotations
+import atexit
 import sys
 import logging
+import mmap
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Final
+from typing import Final, Optional, Set
 from project_config import LOG_LEVEL
 
+# уровень из settings.yaml не меняется за время жизни процесса
+_NUMERIC_LEVEL: Final[int] = getattr(logging, LOG_LEVEL, logging.INFO)
+
+
+@lru_cache(maxsize=None)
 def get_log_path() -> Path:
+    """Путь к лог-файлу (вычисляется и создаёт каталог один раз на процесс)."""
     if getattr(sys, 'frozen', False):  # если запущен из .exe
         base_dir = Path(sys.executable).parent
     else:
@@ -45,38 +59,149 @@ def get_log_path() -> Path:
     return log_path
 
 
+# ---------------------------------------------------------------------------
+# Opt-in (LOG_MMAP=1): запись лога через mmap – memcpy в page cache вместо
+# write() на каждую запись; msync – фоновым потоком раз в sync_interval
+# ---------------------------------------------------------------------------
+class MmapFileHandler(logging.Handler):
+    """Append-only file handler backed by a growing ``mmap`` region (no rotation)."""
+
+    CHUNK: Final[int] = 16 * 1024 * 1024  # рост файла шагами по 16 MiB
+
+    def __init__(self, filename: str, sync_interval: float = 1.0) -> None:
+        super().__init__()
+        self._fd = os.open(filename, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        size = os.fstat(self._fd).st_size
+        # хвост из нулей мог остаться после аварийного завершения – пишем поверх
+        self._pos = self._data_end(size)
+        self._mm: Optional[mmap.mmap] = None
+        self._size = 0
+        self._map(max(size, self._pos + self.CHUNK))
+
+        self._stop = threading.Event()
+        self._syncer = threading.Thread(
+            target=self._sync_loop, args=(sync_interval,), name="log-msync", daemon=True
+        )
+        self._syncer.start()
+
+    def _data_end(self, size: int) -> int:
+        block = 64 * 1024
+        end = size
+        while end > 0:
+            start = max(0, end - block)
+            os.lseek(self._fd, start, os.SEEK_SET)
+            stripped = os.read(self._fd, end - start).rstrip(b"\0")
+            if stripped:
+                return start + len(stripped)
+            end = start
+        return 0
+
+    def _map(self, size: int) -> None:
+        # на Windows размер файла нельзя менять, пока он отображён – сначала закрываем
+        if self._mm is not None:
+            self._mm.close()
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+        self._size = size
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = (self.format(record) + "\n").encode("utf-8")
+            end = self._pos + len(data)
+            if end > self._size:
+                self._map(max(end, self._size + self.CHUNK))
+            self._mm[self._pos:end] = data  # type: ignore[index]
+            self._pos = end
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            if self._mm is not None:
+                self._mm.flush()
+
+    def _sync_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        with self.lock:  # type: ignore[union-attr]
+            if self._mm is not None:
+                self._mm.flush()
+                self._mm.close()
+                self._mm = None
+                # отрезаем незаполненный хвост
+                os.ftruncate(self._fd, self._pos)
+                os.close(self._fd)
+        super().close()
+
+
+# ---------------------------------------------------------------------------
+# Асинхронная запись: хендлеры настраиваются один раз на root-логгере –
+# записи кладутся в очередь, консоль и файл обслуживает один фоновый
+# QueueListener; модульные логгеры своих хендлеров не имеют (propagate)
+# ---------------------------------------------------------------------------
+_LOG_QUEUE: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_LISTENER: Optional[QueueListener] = None
+_CONFIGURED: bool = False
+_CONFIG_LOCK = threading.Lock()
+
+
+def _configure_root(numeric_level: int) -> None:
+    global _LISTENER, _CONFIGURED
+    with _CONFIG_LOCK:
+        if _CONFIGURED:
+            return
+
+        fmt = "%(asctime)s %(levelname)-8s [%(name)s] %(message)s"
+        formatter = logging.Formatter(fmt)
+
+        # --- Console handler ---------------------------------------------
+        console = logging.StreamHandler()
+        console.setLevel(max(numeric_level, console.level))
+        console.setFormatter(formatter)
+
+        # --- File handler: rotating, или mmap при LOG_MMAP=1 ------------
+        log_path = get_log_path()
+
+        file_handler: logging.Handler
+        if os.getenv("LOG_MMAP") == "1":
+            file_handler = MmapFileHandler(str(log_path))
+        else:
+            file_handler = RotatingFileHandler(
+                filename=str(log_path),
+                maxBytes=10 * 1024 * 1024,  # 10 MiB
+                backupCount=5,
+                encoding="utf-8",
+            )
+        file_handler.setLevel(max(numeric_level, file_handler.level))
+        file_handler.setFormatter(formatter)
+
+        _LISTENER = QueueListener(_LOG_QUEUE, console, file_handler, respect_handler_level=True)
+        _LISTENER.start()
+        # дописать очередь до конца перед выходом
+        atexit.register(_LISTENER.stop)
+
+        # записи ниже уровня не попадают даже в очередь (и не форматируются)
+        queue_handler = QueueHandler(_LOG_QUEUE)
+        queue_handler.setLevel(numeric_level)
+        logging.getLogger().addHandler(queue_handler)
+        _CONFIGURED = True
+
+
+_READY_NAMES: Set[str] = set()
+
+
 def setup_logger(name: str) -> logging.Logger:  # noqa: D401 – imperative style
     """Return configured ``logging.Logger`` instance shared across project."""
-    numeric_level: int = getattr(logging, LOG_LEVEL, logging.INFO)
-
     logger = logging.getLogger(name)
-    logger.setLevel(numeric_level)
-
-    # Clear duplicate handlers if re‑invoked
-    if logger.hasHandlers():
-        logger.handlers.clear()
-
-    fmt = "%(asctime)s %(levelname)-8s [%(name)s] %(message)s"
-    formatter = logging.Formatter(fmt)
-
-    # --- Console handler ---------------------------------------------
-    console = logging.StreamHandler()
-    console.setLevel(numeric_level)
-    console.setFormatter(formatter)
-    logger.addHandler(console)
-
-    # --- Rotating file handler ---------------------------------------
-    log_path = get_log_path()
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-
-    file_handler = RotatingFileHandler(
-        filename=str(log_path),
-        maxBytes=10 * 1024 * 1024,  # 10 MiB
-        backupCount=5,
-        encoding="utf-8",
-    )
-    file_handler.setLevel(numeric_level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    if name in _READY_NAMES:
+        return logger
 
+    _configure_root(_NUMERIC_LEVEL)
+    logger.setLevel(_NUMERIC_LEVEL)
+    logger.propagate = True
+    _READY_NAMES.add(name)
     return logger
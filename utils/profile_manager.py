@@ -1,62 +1,205 @@
 from __future__ import annotations
 
+import logging
 import os
 import shutil
+import sys
 import tempfile
-from contextlib import contextmanager
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
 
 import yaml
 from utils.logger import setup_logger
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+
 LOGGER = setup_logger(__name__)
 
-# Load global settings
+# ---------------------------------------------------------------------------
+# settings.yaml: читается лениво, повторно – только если изменился mtime
+# ---------------------------------------------------------------------------
 _SETTINGS_PATH = Path(__file__).resolve().parent.parent / "settings.yaml"
-try:
-    with _SETTINGS_PATH.open("rt", encoding="utf-8") as fh:
-        _SETTINGS = yaml.safe_load(fh) or {}
-except FileNotFoundError:
-    LOGGER.warning("settings.yaml not found at %s; defaulting to temporary profiles", _SETTINGS_PATH)
-    _SETTINGS = {}
 
-# Configuration flags
-KEEP_PROFILES: bool = bool(_SETTINGS.get("keep_profiles", False))
-TEMPLATE_PATH: Path = Path(_SETTINGS.get("chrome_template", "chrome_template/profile")).expanduser().resolve()
-TEMPLATE_PATHS: Path = Path(_SETTINGS.get("chrome_templates", "chrome_template/profiles")).expanduser().resolve()
 
-__all__ = ["prepare_profile"]
+class _ProfileSettings(NamedTuple):
+    keep_profiles: bool
+    template_path: Path     # chrome_template
+    template_paths: Path    # chrome_templates (persistent profiles)
+
+
+_CACHE: Optional[Tuple[int, _ProfileSettings]] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _resolve(settings: Dict[str, Any]) -> _ProfileSettings:
+    return _ProfileSettings(
+        keep_profiles=bool(settings.get("keep_profiles", False)),
+        template_path=Path(settings.get("chrome_template", "chrome_template/profile")).expanduser().resolve(),
+        template_paths=Path(settings.get("chrome_templates", "chrome_template/profiles")).expanduser().resolve(),
+    )
+
+
+def _load_settings() -> _ProfileSettings:
+    """Разобранные и уже резолвленные настройки; пересчёт – только при смене mtime."""
+    global _CACHE
+    try:
+        mtime_ns = _SETTINGS_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        LOGGER.warning("settings.yaml not found at %s; defaulting to temporary profiles", _SETTINGS_PATH)
+        mtime_ns = -1
+
+    with _CACHE_LOCK:
+        if _CACHE is None or _CACHE[0] != mtime_ns:
+            raw: Dict[str, Any] = {}
+            if mtime_ns != -1:
+                with _SETTINGS_PATH.open("rt", encoding="utf-8") as fh:
+                    raw = yaml.load(fh, Loader=_Loader) or {}
+            _CACHE = (mtime_ns, _resolve(raw))
+        return _CACHE[1]
+
+
+__all__ = ["prepare_profile", "prepare_many", "prepare"]
+
+# ---------------------------------------------------------------------------
+# Copy-on-write клонирование файлов шаблона
+# ---------------------------------------------------------------------------
+_FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+
+def _clonefile_func():
+    if sys.platform != "darwin":
+        return None
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL("libc.dylib", use_errno=True)
+        fn = libc.clonefile
+        fn.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+        return fn
+    except (OSError, AttributeError):
+        return None
+
+
+_CLONEFILE = _clonefile_func()
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """copy_function для copytree: reflink (btrfs/xfs/APFS), иначе copy2.
+
+    Клон разделяет блоки с шаблоном до первой записи, поэтому Chrome может
+    писать в профиль как в обычную копию. Жёсткие ссылки не используем –
+    запись Chrome испортила бы сам шаблон.
+    """
+    if _CLONEFILE is not None:
+        if _CLONEFILE(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            shutil.copystat(src, dst)
+            return dst
+    elif sys.platform.startswith("linux"):
+        try:
+            import fcntl
+
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass  # ФС без reflink (ext4, tmpfs, другой том) – обычная копия
+    return shutil.copy2(src, dst)
+
+
+# Только каталоги кэша, которые Chrome пересоздаёт сам. IndexedDB, Service Worker
+# и т.п. – данные сайта (вход, состояние), их копируем как есть.
+_CACHE_DIRS = frozenset({
+    "Cache", "Code Cache", "GPUCache", "ShaderCache", "GrShaderCache", "DawnCache",
+})
+
+
+def _skip_cache_dirs(src: str, names: List[str]) -> Set[str]:
+    # точные имена и только каталоги – файлы с "Cache" в имени не трогаем
+    return {n for n in names if n in _CACHE_DIRS and os.path.isdir(os.path.join(src, n))}
+
+
+def _clone_tree(src: Path, dst: Path) -> None:
+    shutil.copytree(src, dst, ignore=_skip_cache_dirs, copy_function=_clone_file)
 
 @contextmanager
 def prepare_profile(user_alias: str) -> Iterator[Path]:
     """
     Context manager: yields a directory for Chrome user data.
 
-    If KEEP_PROFILES is True, uses `profiles/<alias>` under project root;
-    otherwise, copies TEMPLATE_PATH to a temp dir per session and deletes it.
+    If `keep_profiles` is set, uses `<chrome_templates>/<alias>`;
+    otherwise, copies `chrome_template` to a temp dir per session and deletes it.
     """
-    if KEEP_PROFILES:
+    settings = _load_settings()
+    template = settings.template_path
+    if settings.keep_profiles:
         # Persistent mode: one folder per user
-        project_root = Path(__file__).resolve().parent.parent
-        profiles_dir = TEMPLATE_PATHS
+        profiles_dir = settings.template_paths
         profiles_dir.mkdir(parents=True, exist_ok=True)
         target_dir = profiles_dir / user_alias
         if not target_dir.exists():
-            LOGGER.debug("Creating persistent profile for %s", user_alias)
-            shutil.copytree(TEMPLATE_PATH, target_dir)
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug("Creating persistent profile for %s", user_alias)
+            _clone_tree(template, target_dir)
         else:
-            LOGGER.debug("Reusing persistent profile for %s", user_alias)
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug("Reusing persistent profile for %s", user_alias)
         yield target_dir
     else:
         # Temporary mode: fresh copy each session
         tmp_base = Path(tempfile.gettempdir()) / f"chrome_{user_alias}_{os.getpid()}"
         if tmp_base.exists():
             shutil.rmtree(tmp_base, ignore_errors=True)
-        LOGGER.debug("Copy chrome template to temp %s", tmp_base)
-        shutil.copytree(TEMPLATE_PATH, tmp_base)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Copy chrome template to temp %s", tmp_base)
+        _clone_tree(template, tmp_base)
         try:
             yield tmp_base
         finally:
-            LOGGER.debug("Removing temp profile %s", tmp_base)
-            shutil.rmtree(tmp_base, ignore_errors=True)
\ No newline at end of file
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug("Removing temp profile %s", tmp_base)
+            shutil.rmtree(tmp_base, ignore_errors=True)
+
+
+@contextmanager
+def prepare_many(aliases: Sequence[str]) -> Iterator[List[Path]]:
+    """
+    Context manager: `prepare_profile` for several users at once.
+
+    Копирование шаблонов идёт параллельно (I/O-bound, не больше 2×CPU потоков);
+    на выходе все профили освобождаются через ExitStack – в т.ч. если один из
+    них подготовить не удалось.
+    """
+    aliases = list(aliases)
+    if not aliases:
+        yield []
+        return
+
+    with ExitStack() as stack:
+        cms = [prepare_profile(alias) for alias in aliases]
+        workers = min(len(aliases), (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="profile") as pool:
+            futures = [pool.submit(cm.__enter__) for cm in cms]
+
+        dirs: List[Path] = []
+        error: Optional[BaseException] = None
+        for cm, future in zip(cms, futures):
+            try:
+                dirs.append(future.result())
+            except BaseException as exc:  # noqa: BLE001
+                error = error or exc
+                continue
+            stack.push(cm)
+        if error is not None:
+            raise error
+        yield dirs
+
+
+# обратная совместимость: старое имя
+prepare = prepare_profile